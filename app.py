@@ -3,24 +3,27 @@ from gevent import monkey
 monkey.patch_all()
 
 # ================= STANDARD =================
+import json
+import logging
 import os
-import math
 import secrets
+import time
 import uuid
-import pandas as pd
 from datetime import datetime, timedelta
 import pytz
+import click
 # ================= FLASK =================
 from flask import (
     Flask, render_template, send_from_directory,
-    request, redirect, url_for, session, jsonify, flash
+    request, redirect, url_for, session, jsonify, flash,
+    Response, stream_with_context
 )
 
 # ================= EXTENSIONS =================
 from flask_socketio import SocketIO, emit, join_room
 from flask_wtf import CSRFProtect
 from flask_migrate import Migrate
-from sqlalchemy import or_, case
+from sqlalchemy import or_, case, insert
 from sqlalchemy.orm import joinedload
 from werkzeug.security import generate_password_hash, check_password_hash
 # app.py
@@ -31,6 +34,33 @@ from functools import wraps
 # ================= LOCAL IMPORTS =================
 from push import send_push
 from users.routes import users_bp
+from services.log_config import configure_logging
+from services.menu_cache import get_menu, invalidate_menu
+from services.menu_sync import start_menu_sync, menu_sync_status
+from services.geo import calculate_distance_km
+from services.geo_index import restaurants_delivering_to, invalidate_delivery_index
+from services.listing import get_listing_snapshot, overlay_distance, invalidate_listing
+from services.fragment_cache import get_fragment, put_fragment, invalidate_fragments
+from services.order_stats import admin_order_stats, restaurant_performance, restaurant_dashboard_stats
+from services.order_rollup import backfill_daily_order_stats
+from services.date_windows import parse_day, ist_today, ist_day_window, days_window, within
+from services.reports import admin_report, restaurant_report, items_total_mismatches
+from services.exports import stream_csv, order_rows, cod_rows, ORDER_HEADER, COD_HEADER
+from services.tracking_store import init_tracking_store, save_last_location, last_location
+from services.location_throttle import (
+    accept_location, take_pending, forget_order, forget_rider, tracking_counters,
+    BROADCAST, SCHEDULE, DROP
+)
+from services.breadcrumbs import record_point, rider_assigned, start_breadcrumb_writer
+from services.presence import (
+    init_presence, rider_restaurant_ids, rider_connected, rider_heartbeat,
+    rider_disconnected, online_rider_ids, persist_presence, start_presence_sweeper
+)
+from services.order_feed import (
+    live_orders, order_history, HISTORY_PAGE_SIZE,
+    order_changes, latest_changes_cursor, is_new_order,
+    export_orders_page, iter_export_orders, EXPORT_PAGE_SIZE
+)
 from models import (
     db, Restaurant, RestaurantUser, MenuItem, Order,
     OrderItem, DeliveryPerson, FoodItem, OTP,
@@ -39,6 +69,10 @@ from models import (
 
 # ================= APP =================
 # ================= APP =================
+# JSON lines on stderr at LOG_LEVEL (services/log_config.py)
+configure_logging()
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__)
 
 # 🔐 SECURITY & CSRF CONFIG
@@ -99,10 +133,17 @@ print("DB URI:", app.config["SQLALCHEMY_DATABASE_URI"])
 db.init_app(app)
 csrf = CSRFProtect(app)
 migrate = Migrate(app, db)
+
+# Shared by all workers when set: Socket.IO room fan-out + rider locations
+REDIS_URL = os.getenv("REDIS_URL")
+init_tracking_store(REDIS_URL)
+init_presence(REDIS_URL)
+
 socketio = SocketIO(
     app,
     cors_allowed_origins="*",
-    async_mode="threading",
+    async_mode="gevent",  # greenlet per connection, websockets via gevent-websocket
+    message_queue=REDIS_URL,
     ping_interval=25,
     ping_timeout=60,
     max_http_buffer_size=10_000_000
@@ -121,45 +162,12 @@ def generate_order_id(order_db_id):
     unique_part = uuid.uuid4().hex[:6].upper()
     return f"ORD-{order_db_id}-{unique_part}"
 
-def haversine(lat1, lon1, lat2, lon2):
-    R = 6371
-    lat1, lon1, lat2, lon2 = map(float, [lat1, lon1, lat2, lon2])
-    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-
-    a = math.sin(dlat / 2)**2 + \
-        math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2)**2
-
-    c = 2 * math.asin(math.sqrt(a))
-    return R * c 
-import math
-
-import math
 
-def calculate_distance_km(lat1, lng1, lat2, lng2):
-    if None in (lat1, lng1, lat2, lng2):
-        return 0  # fallback (or raise error)
-
-    lat1 = float(lat1)
-    lng1 = float(lng1)
-    lat2 = float(lat2)
-    lng2 = float(lng2)
-
-    R = 6371  # Earth radius in KM
-    dlat = math.radians(lat2 - lat1)
-    dlng = math.radians(lng2 - lng1)
-
-    a = (
-        math.sin(dlat / 2) ** 2 +
-        math.cos(math.radians(lat1)) *
-        math.cos(math.radians(lat2)) *
-        math.sin(dlng / 2) ** 2
-    )
-
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return round(R * c, 2)
+def restaurant_listing_changed():
+    # Restaurant / offer edited: drop every derived listing structure
+    invalidate_delivery_index()
+    invalidate_listing()
+    invalidate_fragments()
 
 
 # ------------------ ADMIN CONFIG ------------------
@@ -225,20 +233,42 @@ def home():
     now = datetime.now(ist).time()
 
     selected_location = request.args.get("location", "").strip()
+    is_ajax = request.headers.get("X-Requested-With") == "XMLHttpRequest"
 
-    # 🔹 Restaurants by location
-    if selected_location:
-        restaurants = Restaurant.query.filter_by(location=selected_location).all()
-    else:
-        restaurants = Restaurant.query.all()
+    # 🔹 Restaurants by location (precomputed, status-sorted snapshot)
+    snapshot = get_listing_snapshot()
+    cards = snapshot["by_location"].get(selected_location, [])
 
     # 🔹 Location dropdown
-    all_locations = [
-        loc[0]
-        for loc in db.session.query(Restaurant.location).distinct()
-        if loc[0]
-    ]
+    all_locations = snapshot["all_locations"]
+
+    # 🔹 User location
+    user_lat = session.get("user_lat")
+    user_lng = session.get("user_lng")
+    user_location_set = user_lat is not None and user_lng is not None
+
+    # 🚚 Restaurants whose delivery radius covers the user (spatial index)
+    delivering = (
+        restaurants_delivering_to(user_lat, user_lng)
+        if user_location_set else {}
+    )
 
+    # 🔹 Rendered fragment cache: same location + snapshot + deliverable set
+    #    always renders the same cards
+    if is_ajax:
+        cache_key = (
+            "_restaurants", selected_location, snapshot["version"],
+            tuple(sorted(delivering)) if user_location_set else None
+        )
+    elif not user_location_set and "_flashes" not in session:
+        cache_key = ("index", selected_location, snapshot["version"])
+    else:
+        cache_key = None
+
+    if cache_key:
+        html = get_fragment(cache_key)
+        if html is not None:
+            return html
 
     # 🔹 Trending items
     if selected_location:
@@ -256,48 +286,8 @@ def home():
     else:
         trending_items = []
 
-    # 🔹 User location
-    user_lat = session.get("user_lat")
-    user_lng = session.get("user_lng")
-    user_location_set = user_lat is not None and user_lng is not None
-
-    # 🔹 Calculate status
-    for r in restaurants:
-        r.deliverable = True
-        r.distance = None
-
-        # 🚚 Delivery radius
-        if (
-            user_location_set
-            and r.latitude is not None
-            and r.longitude is not None
-            and r.delivery_radius_km
-        ):
-            dist = haversine(
-                float(user_lat),
-                float(user_lng),
-                float(r.latitude),
-                float(r.longitude)
-            )
-            r.distance = round(dist, 1)
-            r.deliverable = dist <= r.delivery_radius_km
-
-        # 🕒 Open status
-        if r.opening_time and r.closing_time:
-            r.is_open = r.opening_time <= now <= r.closing_time
-        else:
-            r.is_open = False
-
-    # ⭐⭐ FINAL SORT (THIS IS THE KEY FIX)
-    restaurants.sort(
-        key=lambda r: (
-            not r.deliverable,            # deliverable first
-            not r.is_open,                # open first
-            not r.can_accept_orders,      # active first
-            r.status == "suspended",      # suspended last
-            r.status == "coming_soon"     # coming soon after open
-        )
-    )
+    # 🔹 Only per-request work: deliverable first, snapshot order otherwise
+    restaurants = overlay_distance(cards, delivering, user_location_set)
 
     # 🔹 SEO
     if selected_location:
@@ -322,41 +312,45 @@ def home():
         )
 
     # 🔹 AJAX load
-    if request.headers.get("X-Requested-With") == "XMLHttpRequest":
-        return render_template(
+    if is_ajax:
+        html = render_template(
             "_restaurants.html",
             restaurants=restaurants,
             trending_items=trending_items,
             now=now
         )
+    else:
+        html = render_template(
+            "index.html",
+            restaurants=restaurants,
+            all_locations=all_locations,
+            selected_location=selected_location,
+            trending_items=trending_items,
+            user_location_set=user_location_set,
+            now=now,
+            seo_title=seo_title,
+            seo_description=seo_description,
+            seo_keywords=seo_keywords
+        )
 
-    return render_template(
-        "index.html",
-        restaurants=restaurants,
-        all_locations=all_locations,
-        selected_location=selected_location,
-        trending_items=trending_items,
-        user_location_set=user_location_set,
-        now=now,
-        seo_title=seo_title,
-        seo_description=seo_description,
-        seo_keywords=seo_keywords
-    )
+    if cache_key:
+        put_fragment(cache_key, html)
+    return html
 
 @app.route("/city/<city_slug>")
 def city_page(city_slug):
     # Convert slug to readable name
     selected_location = city_slug.replace("-", " ").title()
 
+    ist = pytz.timezone("Asia/Kolkata")
+    now = datetime.now(ist).time()
+
     # 🔹 Restaurants in this city
-    restaurants = Restaurant.query.filter_by(location=selected_location).all()
+    snapshot = get_listing_snapshot()
+    cards = snapshot["by_location"].get(selected_location, [])
 
     # 🔹 All locations (for dropdown)
-    all_locations = [
-        loc[0]
-        for loc in db.session.query(Restaurant.location).distinct()
-        if loc[0]
-    ]
+    all_locations = snapshot["all_locations"]
 
     # 🔹 Trending items (city only)
     trending_items = (
@@ -378,38 +372,14 @@ def city_page(city_slug):
 
    
 
-    # 🔹 Delivery + open status
-    for r in restaurants:
-        r.deliverable = True
-        r.distance = None
-
-        if (
-            user_location_set
-            and r.latitude is not None
-            and r.longitude is not None
-            and r.delivery_radius_km
-        ):
-            dist = haversine(
-                float(user_lat),
-                float(user_lng),
-                float(r.latitude),
-                float(r.longitude)
-            )
-            r.distance = round(dist, 1)
-            r.deliverable = dist <= r.delivery_radius_km
-
-        if r.opening_time and r.closing_time:
-            r.is_open = r.opening_time <= now <= r.closing_time
-        else:
-            r.is_open = False
-
-    restaurants.sort(
-        key=lambda r: (
-            not r.deliverable,
-            not r.is_open
-        )
+    delivering = (
+        restaurants_delivering_to(user_lat, user_lng)
+        if user_location_set else {}
     )
 
+    # 🔹 Delivery status on top of the snapshot
+    restaurants = overlay_distance(cards, delivering, user_location_set)
+
     # 🔹 SEO (CITY PAGE)
     seo_title = f"Online Food Delivery in {selected_location} | RuchiGo"
     seo_description = (
@@ -435,76 +405,31 @@ def city_page(city_slug):
     )
 
 
-@app.route('/admin/update-menus', endpoint='update_menus')
-def update_menus():
-    # Google Sheets API scopes
-    scope = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive"
-    ]
-
-    # Load credentials (make sure credentials.json is in your project root)
-    try:
-        creds = Credentials.from_service_account_file("credentials.json", scopes=scope)
-    except FileNotFoundError:
-        flash("Google credentials file not found. Please upload credentials.json.", "danger")
-        return redirect(url_for('admin_dashboard'))
-    except Exception as e:
-        flash(f"Error loading Google credentials: {e}", "danger")
-        return redirect(url_for('admin_dashboard'))
-
-    # Authorize gspread client
-    try:
-        client = gspread.authorize(creds)
-    except Exception as e:
-        flash(f"Failed to authorize Google Sheets client: {e}", "danger")
-        return redirect(url_for('admin_dashboard'))
-
-    restaurants = Restaurant.query.all()
-    updated_restaurants = 0
+def admin_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not session.get("admin_logged_in"):
+            flash("You must be logged in as admin to access this page", "danger")
+            return redirect(url_for("admin_login"))
+        return f(*args, **kwargs)
+    return decorated_function
 
-    for restaurant in restaurants:
-        if not restaurant.sheet_id:
-            continue  # skip restaurants without sheet
 
-        try:
-            sheet = client.open_by_key(restaurant.sheet_id).sheet1
-            data = sheet.get_all_records()
-        except Exception as e:
-            print(f"[ERROR] Could not load sheet for {restaurant.name}: {e}")
-            continue
-
-        for row in data:
-            name = row.get('Name')
-            category = row.get('Category') or "Uncategorized"
-            try:
-                price = float(row.get('Price', 0) or 0)
-            except ValueError:
-                print(f"[WARNING] Invalid price for {name} in {restaurant.name}. Skipping.")
-                continue
-
-            if not name:
-                continue  # skip rows without a name
-
-            # Check if menu item already exists
-            item = MenuItem.query.filter_by(name=name, restaurant_id=restaurant.id).first()
-            if item:
-                item.category = category
-                item.price = price
-            else:
-                new_item = MenuItem(
-                    restaurant_id=restaurant.id,
-                    name=name,
-                    category=category,
-                    price=price
-                )
-                db.session.add(new_item)
+@app.route('/admin/update-menus', endpoint='update_menus')
+@admin_required
+def update_menus():
+    # Sheets are fetched and diffed in a background job (see services/menu_sync.py)
+    if start_menu_sync(app):
+        flash("Menu sync started. Progress: /admin/update-menus/status", "success")
+    else:
+        flash("A menu sync is already running.", "warning")
+    return redirect(url_for('admin_dashboard'))
 
-        db.session.commit()
-        updated_restaurants += 1
 
-    flash(f"Menus updated for {updated_restaurants} restaurants from Google Sheets!", "success")
-    return redirect(url_for('admin_dashboard'))
+@app.route('/admin/update-menus/status')
+@admin_required
+def update_menus_status():
+    return jsonify(menu_sync_status())
 
 from geopy.geocoders import Nominatim
 
@@ -722,6 +647,7 @@ from sqlalchemy import func
 
 @app.route("/place_order", methods=["POST"])
 def place_order():
+    started = time.perf_counter()
 
     # ================= BASIC DETAILS =================
     name = request.form.get("name")
@@ -749,9 +675,6 @@ def place_order():
         request.form.get("customer_lng") or request.form.get("lng")
     )
 
-    print("📍 CUSTOMER LAT:", customer_lat)
-    print("📍 CUSTOMER LNG:", customer_lng)
-
     # ================= ITEMS =================
     item_names = request.form.getlist("item_name[]")
     quantities = request.form.getlist("quantity[]")
@@ -783,8 +706,6 @@ def place_order():
         for i in range(len(item_names))
     )
 
-    print("🧾 ITEMS TOTAL:", items_total)
-
     # ================= LOCATION VALIDATION =================
     if not customer_lat or not customer_lng:
         flash("📍 Please select your delivery location on the map", "danger")
@@ -798,8 +719,6 @@ def place_order():
         customer_lng
     )
 
-    print("📏 DISTANCE (KM):", round(distance_km, 2))
-
     # ================= DELIVERY CHARGE (FINAL AUTHORITY) =================
     delivery_charge, delivery_msg = calculate_delivery_charge(
         distance_km,
@@ -807,9 +726,6 @@ def place_order():
         restaurant
     )
 
-    print("🚚 DELIVERY CHARGE:", delivery_charge)
-    print("ℹ DELIVERY MSG:", delivery_msg)
-
     # ================= FINAL TOTAL =================
     final_total = round(items_total + delivery_charge, 2)
 
@@ -824,8 +740,6 @@ def place_order():
         pincode
     )
 
-    print("🗺 MAP LINK:", map_link)
-
     # ================= CREATE ORDER =================
     new_order = Order(
         restaurant_id=restaurant_id,
@@ -856,33 +770,42 @@ def place_order():
         created_at=datetime.utcnow()
     )
 
+    # ================= SAVE (ONE TRANSACTION) =================
     db.session.add(new_order)
-    db.session.commit()
+    db.session.flush()  # assigns new_order.id
 
-    # ================= ORDER CODE =================
     new_order.order_id = generate_order_code(new_order.id)
-    db.session.commit()
 
-    # ================= ORDER ITEMS =================
-    for i in range(len(item_names)):
-        qty = int(quantities[i])
-        if qty > 0:
-            db.session.add(OrderItem(
-                order_id=new_order.id,
-                item_name=item_names[i],
-                quantity=qty,
-                price=float(prices[i])
-            ))
+    order_items = [
+        {
+            "order_id": new_order.id,
+            "item_name": item_names[i],
+            "quantity": int(quantities[i]),
+            "price": float(prices[i])
+        }
+        for i in range(len(item_names))
+        if int(quantities[i]) > 0
+    ]
+    if order_items:
+        db.session.execute(insert(OrderItem), order_items)
 
     db.session.commit()
-
-    # ================= FINAL DEBUG =================
-    print("✅ ORDER PLACED")
-    print("🆔 ORDER ID:", new_order.order_id)
-    print("📍 FINAL LAT:", new_order.latitude)
-    print("📍 FINAL LNG:", new_order.longitude)
-    print("📏 FINAL KM:", new_order.distance_km)
-    print("🚚 FINAL DELIVERY:", new_order.delivery_charge)
+    notify_restaurant("order_created", new_order)
+
+    # Structured, no customer coordinates; duration_ms feeds orders/sec + p99
+    logger.info(
+        "order placed",
+        extra={
+            "order_id": new_order.order_id,
+            "restaurant_id": restaurant_id,
+            "items": len(order_items),
+            "items_total": items_total,
+            "distance_km": new_order.distance_km,
+            "delivery_charge": delivery_charge,
+            "delivery_msg": delivery_msg,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+    )
 
     flash(f"Order placed successfully! Order ID: {new_order.order_id}", "success")
     return redirect(url_for("myorders", restaurant_id=restaurant_id))
@@ -940,12 +863,9 @@ def admin_dashboard():
         q = q.filter(Order.status == status_filter)
 
     # ---------------- DATE FILTER ----------------
-    if date_filter:
-        try:
-            filter_date = datetime.strptime(date_filter, "%Y-%m-%d").date()
-            q = q.filter(db.func.date(Order.created_at) == filter_date)
-        except ValueError:
-            pass  # ignore invalid date input
+    filter_date = parse_day(date_filter)  # invalid input is ignored
+    if filter_date:
+        q = q.filter(*within(Order.created_at, ist_day_window(filter_date)))
 
     q = q.order_by(Order.created_at.desc())
     pagination = q.paginate(page=page, per_page=10)
@@ -960,40 +880,7 @@ def admin_dashboard():
     yesterday = today - timedelta(days=1)
     week_start = today - timedelta(days=today.weekday())
 
-    stats = {
-        "total_orders": Order.query.count(),
-        "pending": Order.query.filter_by(status="Pending").count(),
-        "preparing": Order.query.filter_by(status="Preparing").count(),
-        "assigned": Order.query.filter(
-            Order.delivery_person_id.isnot(None),
-            Order.status != "Delivered",
-            Order.status != "Cancelled"
-        ).count(),
-        "delivered": Order.query.filter_by(status="Delivered").count(),
-        "cancelled": Order.query.filter_by(status="Cancelled").count(),
-
-        # Today's delivered orders & revenue
-        "total_orders_today": Order.query.filter(
-            db.func.date(Order.created_at) == today,
-            Order.status == "Delivered"
-        ).count(),
-        "total_revenue_today": sum(
-            o.get_final_total() for o in Order.query.filter(
-                db.func.date(Order.created_at) == today,
-                Order.status == "Delivered"
-            ).all()
-        ),
-
-        # Weekly statistics
-        "week_orders": Order.query.filter(Order.created_at >= week_start).count(),
-        "total_revenue": sum(o.get_final_total() for o in Order.query.filter_by(status="Delivered").all()),
-        "weekly_revenue": sum(
-            o.get_final_total() for o in Order.query.filter(
-                Order.created_at >= week_start,
-                Order.status == "Delivered"
-            ).all()
-        )
-    }
+    stats = admin_order_stats(today, week_start)
 
     # ---------------- CLASSIFY ORDERS BY DAY ----------------
     for o in orders:
@@ -1005,21 +892,10 @@ def admin_dashboard():
             o.day_category = "Older"
 
     # ---------------- RESTAURANT PERFORMANCE ----------------
-    restaurant_performance = []
-    for r in restaurants:
-        r_orders = Order.query.filter_by(restaurant_id=r.id).all()
-        today_orders = [o for o in r_orders if o.created_at.date() == today and o.status=="Delivered"]
-        weekly_orders = [o for o in r_orders if o.created_at.date() >= week_start and o.status=="Delivered"]
-        restaurant_performance.append({
-            "id": r.id,
-            "name": r.name,
-            "today_orders": len(today_orders),
-            "today_earnings": sum(o.get_final_total() for o in today_orders),
-            "weekly_orders": len(weekly_orders),
-            "weekly_earnings": sum(o.get_final_total() for o in weekly_orders),
-            "pending": len([o for o in r_orders if o.status == "Pending"]),
-            "completed": len([o for o in r_orders if o.status == "Delivered"])
-        })
+    restaurant_stats = restaurant_performance(today, week_start)
+
+    # Starting point for the quickRefresh delta feed
+    changes_cursor = latest_changes_cursor()
 
     return render_template(
         "admin_dashboard.html",
@@ -1031,7 +907,63 @@ def admin_dashboard():
         date_filter=date_filter,
         restaurants=restaurants,
         stats=stats,
-        restaurant_stats=restaurant_performance
+        restaurant_stats=restaurant_stats,
+        changes_cursor=changes_cursor
+    )
+
+
+@app.route("/api/admin/orders/changes")
+def admin_order_changes():
+    if not session.get("admin_logged_in"):
+        return jsonify({"error": "Unauthorized"}), 401
+
+    since = request.args.get("since", "")
+    orders, cursor = order_changes(since)
+    today = datetime.utcnow().date()
+
+    return jsonify({
+        "cursor": cursor,
+        "orders": [
+            {
+                "id": o.id,
+                "order_id": o.order_id,
+                "restaurant": o.restaurant.name if o.restaurant else None,
+                "customer": o.customer_name,
+                "phone": o.phone,
+                "items": [
+                    {"name": i.item_name, "qty": i.quantity, "price": i.price}
+                    for i in o.items
+                ],
+                "coupon": o.coupon_used,
+                "discount": o.discount or 0,
+                "final_total": o.get_final_total(),
+                "status": o.status,
+                "delivery_person_id": o.delivery_person_id,
+                "placed": o.created_at.strftime('%d-%m-%Y %H:%M') if o.created_at else "",
+                "updated": o.updated_at.isoformat(),
+                "is_new": is_new_order(o, since, today),
+            }
+            for o in orders
+        ]
+    })
+
+
+# ---------------- RESTAURANT LIVE FEED ----------------
+def notify_restaurant(event, order):
+    """
+    Pushes a compact order event to the restaurant's open dashboards
+    (room restaurant_<id>). The dashboard patches the matching row.
+    """
+    socketio.emit(
+        event,
+        {
+            "id": order.id,
+            "order_id": order.order_id,
+            "status": order.status,
+            "delivery_person_id": order.delivery_person_id,
+            "payment_type": order.payment_type,
+        },
+        room=f"restaurant_{order.restaurant_id}"
     )
 
 
@@ -1064,6 +996,8 @@ def update_status(order_id):
         room=f"order_{order.order_id}"
     )
 
+    notify_restaurant("order_updated", order)
+
     print("📤 Emitted status update:", order.order_id, order.status)
 
     flash("Order status updated!", "success")
@@ -1075,14 +1009,6 @@ def admin_logout():
     session.pop("admin_logged_in", None)
     flash("Logged out successfully", "success")
     return redirect(url_for("admin_login"))
-def admin_required(f):
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        if not session.get("admin_logged_in"):
-            flash("You must be logged in as admin to access this page", "danger")
-            return redirect(url_for("admin_login"))
-        return f(*args, **kwargs)
-    return decorated_function
 # ------------------ RESTAURANT OWNER ------------------
 @app.route("/restaurant/login", methods=["GET", "POST"])
 def restaurant_login():
@@ -1118,10 +1044,8 @@ def restaurant_dashboard():
     yesterday = today - timedelta(days=1)
     week_ago = today - timedelta(days=7)
 
-    # Fetch orders only for this restaurant
-    orders = Order.query.filter_by(
-        restaurant_id=restaurant_id
-    ).order_by(Order.created_at.desc()).all()
+    # Live feed: today's orders + older ones still open (history is paged)
+    orders = live_orders(restaurant_id, today)
 
     # Classify orders by day
     for o in orders:
@@ -1132,40 +1056,41 @@ def restaurant_dashboard():
         else:
             o.day_category = "Older"
 
-    today_orders = [o for o in orders if o.day_category == "Today"]
-    delivered_today_orders = [o for o in today_orders if o.status == "Delivered"]
+    stats = restaurant_dashboard_stats(restaurant_id, today, week_ago)
 
-    stats = {
-        "today_orders": len(today_orders),
-        "delivered_today": len(delivered_today_orders),
-        "pending_today": len([o for o in today_orders if o.status == "Pending"]),
-        "cancelled_today": len([o for o in today_orders if o.status == "Cancelled"]),
-        "active_orders": len([o for o in orders if o.status in ["Accepted", "Preparing","Ready", "Out for Delivery"]]),
-        "today_earnings": sum(o.get_final_total() for o in delivered_today_orders),
-        "today_cod_amount": sum(o.get_final_total() for o in delivered_today_orders if o.payment_type == "COD"),
-        "today_online_amount": sum(o.get_final_total() for o in delivered_today_orders if o.payment_type == "Online"),
-        "weekly_orders": len([o for o in orders if o.created_at.date() >= week_ago]),
-        "weekly_earnings": sum(o.get_final_total() for o in orders if o.created_at.date() >= week_ago and o.status == "Delivered"),
-        "weekly_delivered_orders": len([o for o in orders if o.created_at.date() >= week_ago and o.status == "Delivered"])
-    }
-     
     # ------------------ Delivery Boy Status ------------------
-    # Mark inactive delivery boys offline
-    threshold = datetime.utcnow() - timedelta(minutes=5)
+    # From the presence tracker (socket heartbeats), no DB work
+    online_ids = online_rider_ids(restaurant_id)
 
-    inactive_delivery_persons = DeliveryPerson.query.filter(
-        DeliveryPerson.is_online == True,
-        DeliveryPerson.last_seen < threshold
-    ).all()
+    # ✅ FIXED: Only this restaurant’s delivery boys
+    delivery_persons = (
+        DeliveryPerson.query
+        .join(RestaurantDelivery)
+        .filter(RestaurantDelivery.restaurant_id == restaurant_id)
+        .order_by(DeliveryPerson.name)
+        .all()
+    )
 
-    for dp in inactive_delivery_persons:
-        dp.is_online = False
 
-    db.session.commit()
+    return render_template(
+        "restaurant_dashboard.html",
+        stats=stats,
+        orders=orders,
+        delivery_persons=delivery_persons,
+        online_rider_ids=online_ids
+    )
+@app.route("/restaurant/orders/history")
+def restaurant_order_history():
+    restaurant_id = session.get("restaurant_id")
+    if not restaurant_id:
+        return jsonify({"error": "Unauthorized"}), 401
 
+    before_id = request.args.get("before_id", type=int)
+    limit = request.args.get("limit", HISTORY_PAGE_SIZE, type=int)
 
+    today = datetime.utcnow().date()
+    orders, next_before_id = order_history(restaurant_id, today, before_id, limit)
 
-    # ✅ FIXED: Only this restaurant’s delivery boys
     delivery_persons = (
         DeliveryPerson.query
         .join(RestaurantDelivery)
@@ -1174,13 +1099,44 @@ def restaurant_dashboard():
         .all()
     )
 
+    online_ids = online_rider_ids(restaurant_id)
+    html = "".join(
+        render_template(
+            "_restaurant_order_row.html",
+            order=order,
+            delivery_persons=delivery_persons,
+            online_rider_ids=online_ids
+        )
+        for order in orders
+    )
+    return jsonify({"html": html, "next_before_id": next_before_id})
+
+
+@app.route("/restaurant/orders/<int:order_id>/row")
+def restaurant_order_row(order_id):
+    # Single rendered row, fetched by the dashboard on order_created
+    restaurant_id = session.get("restaurant_id")
+    if not restaurant_id:
+        return "", 401
+
+    order = Order.query.filter_by(id=order_id, restaurant_id=restaurant_id).first_or_404()
+
+    delivery_persons = (
+        DeliveryPerson.query
+        .join(RestaurantDelivery)
+        .filter(RestaurantDelivery.restaurant_id == restaurant_id)
+        .order_by(DeliveryPerson.name)
+        .all()
+    )
 
     return render_template(
-        "restaurant_dashboard.html",
-        stats=stats,
-        orders=orders,
-        delivery_persons=delivery_persons
+        "_restaurant_order_row.html",
+        order=order,
+        delivery_persons=delivery_persons,
+        online_rider_ids=online_rider_ids(restaurant_id)
     )
+
+
 @app.route("/restaurant/delivery-persons")
 def restaurant_delivery_persons():
     restaurant_id = session.get("restaurant_id")
@@ -1264,6 +1220,7 @@ def restaurant_update_status(order_id):
 
     order.status = new_status
     db.session.commit()
+    notify_restaurant("order_updated", order)
 
     flash("Order status updated!", "success")
     return redirect(url_for("restaurant_dashboard"))
@@ -1296,8 +1253,7 @@ def delivery_login():
             session["delivery_person_name"] = dp.name
             session["restaurant_id"] = dp.restaurant_id
 
-            # 🔥 UPDATE ONLINE STATUS
-            dp.is_online = True
+            # Online status follows the dashboard socket (presence tracker)
             dp.last_seen = datetime.utcnow()
             db.session.commit()
 
@@ -1345,6 +1301,8 @@ def delivery_dashboard():
             order.delivered_time = datetime.utcnow()
             order.payment_type = entered_payment_type
             db.session.commit()
+            notify_restaurant("order_updated", order)
+            forget_order(order.id)
             flash(f"Order {order.order_id} delivered successfully", "success")
         else:
             # ❗ NOTHING changes on wrong OTP
@@ -1433,14 +1391,6 @@ def delivery_logout():
     return redirect(url_for("delivery_login"))
 from datetime import datetime, timedelta
 
-def update_delivery_status():
-    threshold = datetime.utcnow() - timedelta(minutes=5)
-    DeliveryPerson.query.filter(
-        DeliveryPerson.is_online == True,
-        DeliveryPerson.last_seen < threshold
-    ).update({"is_online": False})
-    db.session.commit()
-
 @app.route("/admin/add_delivery_person", methods=["GET", "POST"])
 def add_delivery_person():
     if not session.get("admin_logged_in"):
@@ -1516,6 +1466,7 @@ def add_restaurant():
         )
         db.session.add(restaurant)
         db.session.commit()  # save restaurant first to get ID
+        restaurant_listing_changed()
 
         # ---- Admin user for this restaurant ----
         admin_username = request.form.get("admin_username")
@@ -1566,24 +1517,18 @@ def menu(restaurant_id):
     if not restaurant.sheet_url:
         return "Error: No Google Sheet URL set for this restaurant"
 
+    # 📋 Cached menu (refreshed in background, stale copy served on failure)
     try:
-        df = pd.read_csv(restaurant.sheet_url)
-        items = df.to_dict(orient="records")
-
-        menu_by_category = {}
-        for item in items:
-            category = item.get("category", "Other")
-            menu_by_category.setdefault(category, []).append(item)
-
-        return render_template(
-            "menu.html",
-            restaurant=restaurant,
-            menu_by_category=menu_by_category
-        )
-
+        menu_by_category = get_menu(restaurant.id, restaurant.sheet_url)
     except Exception as e:
         return f"Error loading menu: {e}"
 
+    return render_template(
+        "menu.html",
+        restaurant=restaurant,
+        menu_by_category=menu_by_category
+    )
+
 
 @app.route("/restaurant/assign_delivery/<int:order_id>", methods=["POST"])
 def restaurant_assign_delivery(order_id):
@@ -1620,6 +1565,7 @@ def restaurant_assign_delivery(order_id):
         },
         room=f"delivery_{dp.id}"
     )
+    notify_restaurant("order_updated", order)
 
     flash(f"Delivery boy {dp.name} assigned to Order {order.order_id}", "success")
     return redirect(url_for("restaurant_dashboard"))
@@ -1631,6 +1577,7 @@ def start_delivery(order_id):
     print("BEFORE STATUS:", order.status)   # 👈 ADD
     order.status = "Started"
     db.session.commit()
+    notify_restaurant("order_updated", order)
     print("AFTER STATUS:", order.status)    # 👈 ADD
 
     return jsonify(success=True)
@@ -1643,12 +1590,23 @@ def edit_restaurant(restaurant_id):
         restaurant.name = request.form["name"]
         restaurant.sheet_url = request.form.get("sheet_url")  # optional
         db.session.commit()
+        invalidate_menu(restaurant.id, restaurant.sheet_url)
+        restaurant_listing_changed()
         flash("Restaurant updated successfully!", "success")
         return redirect(url_for("admin_dashboard"))
     
     return render_template("edit_restaurant.html", restaurant=restaurant)
 
 
+@app.route("/admin/menu-cache/<int:restaurant_id>/invalidate", methods=["POST"])
+@admin_required
+def invalidate_menu_cache(restaurant_id):
+    restaurant = Restaurant.query.get_or_404(restaurant_id)
+    invalidate_menu(restaurant.id, restaurant.sheet_url)
+    flash(f"Menu for '{restaurant.name}' will be reloaded from the sheet", "success")
+    return redirect(url_for("admin_dashboard"))
+
+
 
 
 
@@ -1726,6 +1684,8 @@ def delivery_mark_delivered():
     order.delivered_time = datetime.utcnow()
 
     db.session.commit()
+    notify_restaurant("order_updated", order)
+    forget_order(order.id)
 
     return redirect(url_for("delivery_dashboard"))
 
@@ -1761,34 +1721,39 @@ def confirm_delivery(order_id):
     order.delivered_time = datetime.utcnow()
     order.otp = None  # 🔥 invalidate OTP
     db.session.commit()
+    notify_restaurant("order_updated", order)
+    forget_order(order.id)
 
     return jsonify({"success": True})
 
 @app.route('/api/admin-orders')
 def admin_orders_api():
-    orders = Order.query.order_by(Order.id.desc()).all()
+    """
+    ?after_id=&limit=  one keyset page, newest first
+    ?format=ndjson     every order after after_id, one JSON object per line
+    Admin only: the export carries customer names and phone numbers.
+    """
+    if not session.get("admin_logged_in"):
+        return jsonify({"error": "Unauthorized"}), 401
+
+    after_id = request.args.get("after_id", type=int)
+
+    if request.args.get("format") == "ndjson":
+        def generate():
+            for order in iter_export_orders(after_id):
+                yield json.dumps(order) + "\n"
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype="application/x-ndjson"
+        )
+
+    limit = request.args.get("limit", EXPORT_PAGE_SIZE, type=int)
+    orders, next_after_id = export_orders_page(after_id, limit)
 
     return {
-        "orders": [
-            {
-                "id": o.id,
-                "order_id": o.order_id,
-                "restaurant": o.restaurant.name,
-                "customer": o.customer_name,
-                "phone": o.phone,
-                "items": [
-                    {
-                        "name": i.item_name,
-                        "qty": i.quantity,
-                        "price": i.price
-                    } for i in o.items
-                ],
-                "total": o.get_final_total(),
-                "status": o.status,
-                "time": o.created_at.strftime("%d-%m-%Y %H:%M"),
-            }
-            for o in orders
-        ]
+        "orders": orders,
+        "next_after_id": next_after_id
     }
 @app.route("/restaurant/orders_partial")
 def restaurant_orders_partial():
@@ -1824,13 +1789,11 @@ def restaurants_page():
     selected_location = request.args.get('location', '')  # get selected location from URL
 
     # Fetch restaurants
-    if selected_location:
-        restaurants = Restaurant.query.filter_by(location=selected_location).all()
-    else:
-        restaurants = Restaurant.query.all()
+    snapshot = get_listing_snapshot()
+    restaurants = snapshot["by_location"].get(selected_location, [])
 
-    # Get all unique locations from DB for dropdown
-    all_locations = [loc[0] for loc in db.session.query(Restaurant.location).distinct().all() if loc[0]]
+    # Get all unique locations for dropdown
+    all_locations = snapshot["all_locations"]
 
     return render_template(
         'index.html',
@@ -1839,22 +1802,42 @@ def restaurants_page():
         selected_location=selected_location
     )
 
+def csv_response(filename, header, rows):
+    # Streamed download; rows is a generator reading the DB in batches
+    return Response(
+        stream_with_context(stream_csv(header, rows)),
+        mimetype="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
+@app.route("/restaurant/delivery_boys_cod_summary/export")
+def delivery_boys_cod_summary_export():
+    restaurant_id = session.get("restaurant_id")
+    if not restaurant_id:
+        return redirect(url_for("restaurant_login"))
+
+    selected_date = parse_day(request.args.get("date")) or ist_today()
+
+    return csv_response(
+        f"cod_summary_{selected_date.isoformat()}.csv",
+        COD_HEADER,
+        cod_rows(restaurant_id, ist_day_window(selected_date))
+    )
+
+
 @app.route("/restaurant/delivery_boys_cod_summary", methods=["GET"])
 def delivery_boys_cod_summary():
     restaurant_id = session.get("restaurant_id")
     if not restaurant_id:
         return redirect(url_for("restaurant_login"))
 
-    # Get date filter from query params
-    date_str = request.args.get("date")
-    if date_str:
-        selected_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-    else:
-        selected_date = datetime.utcnow().date()
+    # Get date filter from query params (an India-local day)
+    selected_date = parse_day(request.args.get("date")) or ist_today()
 
     # Get all delivered orders for the selected date
     orders = Order.query.filter_by(restaurant_id=restaurant_id, status="Delivered").filter(
-        db.func.date(Order.delivered_time) == selected_date
+        *within(Order.delivered_time, ist_day_window(selected_date))
     ).all()
 
     # Create COD summary per delivery person
@@ -1892,103 +1875,40 @@ from flask import render_template, request, session, redirect, url_for
 from datetime import datetime
 from models import Order, db
 
-@app.route("/restaurant/reports", methods=["GET", "POST"])
-def restaurant_reports():
+@app.route("/restaurant/reports/export")
+def restaurant_reports_export():
     restaurant_id = session.get("restaurant_id")
     if not restaurant_id:
         return redirect(url_for("restaurant_login"))
 
-    from_date = request.form.get("from_date")
-    to_date = request.form.get("to_date")
-
-    # Base query for the restaurant
-    query = Order.query.filter_by(restaurant_id=restaurant_id)
-    if from_date:
-        query = query.filter(Order.created_at >= datetime.strptime(from_date, "%Y-%m-%d"))
-    if to_date:
-        query = query.filter(Order.created_at <= datetime.strptime(to_date, "%Y-%m-%d"))
-
-    orders = query.all()
-
-    # Initialize totals
-    total_orders = len(orders)
-    delivered_orders = 0
-    cancelled_orders = 0
-    total_items_total = 0
-    total_delivery_total = 0
-    total_coupon_discount = 0
-    total_restaurant_offer_discount = 0
-    total_earnings = 0
-    cod_amount = 0
-    online_amount = 0
-
-    daywise = {}
-
-    for o in orders:
-        day = o.created_at.strftime("%d-%m-%Y")
-        if day not in daywise:
-            daywise[day] = {
-                "orders": 0,
-                "delivered": 0,
-                "cancelled": 0,
-                "items_total": 0,
-                "delivery_total": 0,
-                "coupon_discount": 0,
-                "restaurant_offer_discount": 0,
-                "grand_total": 0
-            }
-
-        daywise[day]["orders"] += 1
-
-        if o.status == "Delivered":
-            delivered_orders += 1
-
-            # Compute totals
-            items_total = sum(i.quantity * i.price for i in o.items)
-            delivery_total = o.delivery_charge or 0
-            restaurant_offer_discount = o.restaurant_offer_discount or 0
-            coupon_discount = o.discount or 0  # <-- discount is now ONLY coupon
-
-            # Update totals
-            total_items_total += items_total
-            total_delivery_total += delivery_total
-            total_coupon_discount += coupon_discount
-            total_restaurant_offer_discount += restaurant_offer_discount
+    window = days_window(
+        parse_day(request.args.get("from_date")),
+        parse_day(request.args.get("to_date"))
+    )
 
-            grand_total = items_total + delivery_total - coupon_discount - restaurant_offer_discount
-            total_earnings += grand_total
+    return csv_response(
+        "restaurant_orders.csv",
+        ORDER_HEADER,
+        order_rows(restaurant_id, window)
+    )
 
-            # COD / Online
-            if o.payment_type == "COD":
-                cod_amount += grand_total
 
-            # Daywise aggregation
-            daywise[day]["delivered"] += 1
-            daywise[day]["items_total"] += items_total
-            daywise[day]["delivery_total"] += delivery_total
-            daywise[day]["coupon_discount"] += coupon_discount
-            daywise[day]["restaurant_offer_discount"] += restaurant_offer_discount
-            daywise[day]["grand_total"] += grand_total
+@app.route("/restaurant/reports", methods=["GET", "POST"])
+def restaurant_reports():
+    restaurant_id = session.get("restaurant_id")
+    if not restaurant_id:
+        return redirect(url_for("restaurant_login"))
 
-        elif o.status == "Cancelled":
-            cancelled_orders += 1
-            daywise[day]["cancelled"] += 1
+    from_date = request.form.get("from_date")
+    to_date = request.form.get("to_date")
 
-    online_amount = total_earnings - cod_amount
+    # to_date is inclusive
+    window = days_window(parse_day(from_date), parse_day(to_date))
+    report = restaurant_report(restaurant_id, window)
 
     return render_template(
         "restaurant_reports.html",
-        total_orders=total_orders,
-        delivered_orders=delivered_orders,
-        cancelled_orders=cancelled_orders,
-        total_items_total=total_items_total,
-        total_delivery_total=total_delivery_total,
-        total_coupon_discount=total_coupon_discount,
-        total_restaurant_offer_discount=total_restaurant_offer_discount,
-        total_earnings=total_earnings,
-        cod_amount=cod_amount,
-        online_amount=online_amount,
-        daywise=daywise,
+        **report,
         from_date=from_date,
         to_date=to_date
     )
@@ -2004,92 +1924,32 @@ from sqlalchemy import func, case
 from models import Restaurant, Order, OrderItem
 from sqlalchemy import func, case
 
+@app.route("/admin/reports/export")
+@admin_required
+def admin_reports_export():
+    window = days_window(
+        parse_day(request.args.get("from")),
+        parse_day(request.args.get("to"))
+    )
+
+    return csv_response(
+        "admin_orders.csv",
+        ORDER_HEADER,
+        order_rows(request.args.get("restaurant_id", type=int), window)
+    )
+
+
 @app.route("/admin/reports")
 def admin_reports():
     restaurants = Restaurant.query.all()
 
     restaurant_id = request.args.get("restaurant_id")
-    report_type = request.args.get("type", "day")   # day / week
+    report_type = request.args.get("type", "day")   # day / week / month
     from_date = request.args.get("from")
     to_date = request.args.get("to")
 
-    # ---------- CASE STATEMENTS (SQLAlchemy 2.x compatible) ----------
-    delivered_case = case((Order.status == "Delivered", 1), else_=0)
-    cancelled_case = case((Order.status == "Cancelled", 1), else_=0)
-
-    items_case = case((Order.status == "Delivered", Order.items_total), else_=0)
-    delivery_case = case((Order.status == "Delivered", Order.delivery_charge), else_=0)
-
-    coupon_discount_case = case((Order.status == "Delivered", Order.discount), else_=0)
-    restaurant_offer_case = case((Order.status == "Delivered", Order.restaurant_offer_discount), else_=0)
-
-    # ---------- MAIN REPORT QUERY ----------
-    query = (
-        db.session.query(
-            Restaurant.name.label("restaurant"),
-            func.count(func.distinct(Order.id)).label("total_orders"),
-            func.sum(delivered_case).label("delivered"),
-            func.sum(cancelled_case).label("cancelled"),
-            func.coalesce(func.sum(items_case), 0).label("items_total"),
-            func.coalesce(func.sum(delivery_case), 0).label("delivery_total"),
-            func.coalesce(func.sum(coupon_discount_case), 0).label("coupon_discount_total"),
-            func.coalesce(func.sum(restaurant_offer_case), 0).label("restaurant_offer_total"),
-            (
-                func.coalesce(func.sum(items_case), 0) +
-                func.coalesce(func.sum(delivery_case), 0) -
-                func.coalesce(func.sum(coupon_discount_case), 0) -
-                func.coalesce(func.sum(restaurant_offer_case), 0)
-            ).label("total_earning")
-        )
-        .join(Order, Order.restaurant_id == Restaurant.id)
-        .group_by(Restaurant.name)
-    )
-
-    # ---------- FILTERS ----------
-    if restaurant_id:
-        query = query.filter(Order.restaurant_id == restaurant_id)
-    if from_date and to_date:
-        query = query.filter(Order.created_at.between(from_date, to_date))
-
-    # ---------- GROUPING ----------
-    if report_type == "day":
-        query = query.add_columns(func.date(Order.created_at).label("period")).group_by(
-            Restaurant.name, func.date(Order.created_at)
-        )
-    else:
-        query = query.add_columns(func.strftime('%Y-%W', Order.created_at).label("period")).group_by(
-            Restaurant.name, func.strftime('%Y-%W', Order.created_at)
-        )
-
-    # ---------- ORDER ----------
-    query = query.order_by(func.date(Order.created_at).desc(), Restaurant.name.asc())
-    reports = query.all()
-
-    # ---------- SUMMARY QUERY ----------
-    summary_query = (
-        db.session.query(
-            Restaurant.name.label("restaurant"),
-            func.coalesce(func.sum(case((Order.status == "Delivered", Order.items_total), else_=0)), 0).label("items_total"),
-            func.coalesce(func.sum(case((Order.status == "Delivered", Order.delivery_charge), else_=0)), 0).label("delivery_total"),
-            func.coalesce(func.sum(case((Order.status == "Delivered", Order.discount), else_=0)), 0).label("coupon_discount_total"),
-            func.coalesce(func.sum(case((Order.status == "Delivered", Order.restaurant_offer_discount), else_=0)), 0).label("restaurant_offer_total"),
-            (
-                func.coalesce(func.sum(case((Order.status == "Delivered", Order.items_total), else_=0)), 0) +
-                func.coalesce(func.sum(case((Order.status == "Delivered", Order.delivery_charge), else_=0)), 0) -
-                func.coalesce(func.sum(case((Order.status == "Delivered", Order.discount), else_=0)), 0) -
-                func.coalesce(func.sum(case((Order.status == "Delivered", Order.restaurant_offer_discount), else_=0)), 0)
-            ).label("total_earning")
-        )
-        .join(Order, Order.restaurant_id == Restaurant.id)
-        .group_by(Restaurant.name)
-    )
-
-    if restaurant_id:
-        summary_query = summary_query.filter(Order.restaurant_id == restaurant_id)
-    if from_date and to_date:
-        summary_query = summary_query.filter(Order.created_at.between(from_date, to_date))
-
-    summary = summary_query.all()
+    window = days_window(parse_day(from_date), parse_day(to_date))
+    reports, summary = admin_report(restaurant_id, window, report_type)
 
     return render_template(
         "admin_reports.html",
@@ -2119,8 +1979,8 @@ def mark_not_delivered(order_id):
 
     db.session.commit()
 
-    # 🔔 Notify restaurant (example)
-    print(f"📢 Notify Restaurant {order.restaurant_id}: Order {order.order_id} failed")
+    # 🔔 Notify restaurant
+    notify_restaurant("order_updated", order)
 
     return {"success": True}
 @app.route("/feedback/<int:order_id>", methods=['POST'])
@@ -2132,6 +1992,7 @@ def delivery_feedback(order_id):
     order.delivery_feedback = feedback
     order.status = "Delivery Failed"
     db.session.commit()
+    notify_restaurant("order_updated", order)
 
     return jsonify({"success": True})
 @app.route("/delivery_feedback_notifications")
@@ -2311,6 +2172,7 @@ def add_offer(restaurant_id):
         )
         db.session.add(new_offer)
         db.session.commit()
+        restaurant_listing_changed()
         flash("Offer added successfully", "success")
         return redirect(url_for("manage_offers", restaurant_id=restaurant_id))
 
@@ -2333,6 +2195,7 @@ def edit_offer(offer_id):
         offer.is_active = True if request.form.get("is_active") else False
 
         db.session.commit()
+        restaurant_listing_changed()
         flash("Offer updated successfully", "success")
         return redirect(url_for("manage_offers", restaurant_id=restaurant.id))
 
@@ -2345,6 +2208,7 @@ def delete_offer(offer_id):
     restaurant_id = offer.restaurant_id
     db.session.delete(offer)
     db.session.commit()
+    restaurant_listing_changed()
     flash("Offer deleted successfully", "success")
     return redirect(url_for("manage_offers", restaurant_id=restaurant_id))
 
@@ -2423,6 +2287,7 @@ def edit_restaurant_card(restaurant_id):
             return redirect(request.url)
 
         db.session.commit()
+        restaurant_listing_changed()
         flash("Restaurant card updated successfully!", "success")
         return redirect(url_for("restaurant_dashboard", restaurant_id=restaurant.id))
 
@@ -2446,6 +2311,7 @@ def toggle_offer_status(offer_id):
         ).update({RestaurantOffer.is_active: False})
 
     db.session.commit()
+    restaurant_listing_changed()
     flash("Offer status updated", "success")
 
     return redirect(request.referrer)
@@ -2679,24 +2545,56 @@ def track_order(order_id):
 from flask_socketio import emit, join_room
 
 
-# global or Redis (recommended)
-last_locations = {}
+def broadcast_location(order_id, lat, lng):
+    save_last_location(order_id, lat, lng)
+    socketio.emit(
+        "delivery_location_update",
+        {"lat": lat, "lng": lng},
+        room=f"order_{order_id}",
+    )
+
+
+def flush_location_later(order_id, delay):
+    # Trailing edge of a coalesced burst: send only the newest position
+    socketio.sleep(delay)
+    location = take_pending(order_id)
+    if location:
+        broadcast_location(order_id, *location)
+
 
 @socketio.on("delivery_location_update")
 def handle_location(data):
-    order_id = data["order_id"]
-    lat = data["lat"]
-    lng = data["lng"]
+    try:
+        order_id = int(data["order_id"])
+        lat = float(data["lat"])
+        lng = float(data["lng"])
+    except (KeyError, TypeError, ValueError):
+        return
 
-    print(f"🚴 Delivery GPS → Order {order_id}: {lat}, {lng}")
+    rider_id = session.get("delivery_person_id")
+    if rider_id and rider_heartbeat(rider_id):
+        persist_presence([rider_id], True)
 
-    last_locations[order_id] = (lat, lng)
+    action, delay = accept_location(rider_id or request.sid, order_id, lat, lng)
+    if action == DROP:
+        return
 
-    emit(
-        "delivery_location_update",
-        {"lat": lat, "lng": lng},
-        room=f"order_{order_id}",
-    )
+    # Trail + rider position, written in batches by the breadcrumb writer;
+    # only from a logged-in rider for an order assigned to them
+    if rider_id and rider_assigned(rider_id, order_id):
+        record_point(order_id, rider_id, lat, lng)
+
+    if action == BROADCAST:
+        broadcast_location(order_id, lat, lng)
+    elif action == SCHEDULE:
+        socketio.start_background_task(flush_location_later, order_id, delay)
+
+
+@app.route("/admin/tracking/stats")
+@admin_required
+def tracking_stats():
+    # Received vs broadcast location updates on this worker
+    return jsonify(tracking_counters())
 
 @socketio.on("join_order_room")
 def join_order(data):
@@ -2704,16 +2602,47 @@ def join_order(data):
     join_room(f"order_{order_id}")
 
     # 🔥 SEND LAST LOCATION INSTANTLY
-    if order_id in last_locations:
-        lat, lng = last_locations[order_id]
+    location = last_location(order_id)
+    if location:
+        lat, lng = location
         emit(
             "delivery_location_update",
             {"lat": lat, "lng": lng},
         )
+# ------------------ RIDER PRESENCE ------------------
+@socketio.on("connect")
+def socket_connect(auth=None):
+    rider_id = session.get("delivery_person_id")
+    if rider_id and rider_connected(rider_id, rider_restaurant_ids(rider_id)):
+        persist_presence([rider_id], True)
+
+
+@socketio.on("disconnect")
+def socket_disconnect(reason=None):
+    rider_id = session.get("delivery_person_id")
+    forget_rider(rider_id or request.sid)
+    if rider_id and rider_disconnected(rider_id):
+        persist_presence([rider_id], False)
+
+
+@socketio.on("rider_heartbeat")
+def handle_rider_heartbeat(data=None):
+    rider_id = session.get("delivery_person_id")
+    if rider_id and rider_heartbeat(rider_id):
+        persist_presence([rider_id], True)
+
+
 @socketio.on("join_delivery_room")
 def join_delivery_room(data):
     join_room(f"delivery_{data['delivery_person_id']}")
 
+@socketio.on("join_restaurant_room")
+def join_restaurant_room(data=None):
+    # Room comes from the login session, not from the client
+    restaurant_id = session.get("restaurant_id")
+    if restaurant_id:
+        join_room(f"restaurant_{restaurant_id}")
+
 # ------------------ track apge live ------------------
 @app.route("/track")
 def track_page():
@@ -2740,6 +2669,9 @@ def live_update_status(order_id):
     order = Order.query.get(order_id)
     order.status = request.form.get("status")
     db.session.commit()
+    notify_restaurant("order_updated", order)
+    if order.status in ("Delivered", "Cancelled"):
+        forget_order(order.id)
 
     send_push(order, f"Order {order.order_id} is now {order.status}")
 
@@ -3008,11 +2940,42 @@ def safe_int(value, default=0):
     except (TypeError, ValueError):
         return default
 
-# ------------------ DB INIT ------------------
+# ------------------ BACKGROUND WORKERS ------------------
+def start_background_workers():
+    """
+    Breadcrumb writer + presence sweeper, one of each per server process.
+    Called by the server entry points only (gunicorn post_worker_init,
+    the __main__ block), never on import, so CLI commands stay one-shot.
+    """
+    start_breadcrumb_writer(app)
+    start_presence_sweeper(app)
+
+@app.cli.command("backfill-order-stats")
+def backfill_order_stats_command():
+    # Rebuild daily_order_stats from the orders table
+    print(f"✅ {backfill_daily_order_stats()} rollup rows rebuilt")
+
+
+@app.cli.command("check-items-total")
+@click.option("--restaurant-id", type=int, default=None)
+@click.option("--from", "from_date", default=None, help="YYYY-MM-DD")
+@click.option("--to", "to_date", default=None, help="YYYY-MM-DD")
+def check_items_total_command(restaurant_id, from_date, to_date):
+    # Batch reconciliation: stored items_total vs sum of line items
+    window = days_window(parse_day(from_date), parse_day(to_date))
+    mismatches = items_total_mismatches(restaurant_id, window)
+
+    for m in mismatches:
+        print(
+            f"⚠️ Order {m['order_id']} (id {m['id']}, restaurant {m['restaurant_id']}): "
+            f"stored ₹{m['stored']} vs items ₹{m['computed']}"
+        )
+    print(f"✅ {len(mismatches)} order(s) with mismatched items_total")
 
 # ------------------ RUN ------------------
 # Your routes here...
 
 if __name__ == "__main__":
+    start_background_workers()
     port = int(os.environ.get("PORT", 5000))
     socketio.run(app, host="0.0.0.0", port=port, debug=True)
\ No newline at end of file
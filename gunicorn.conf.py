@@ -1,5 +1,18 @@
-worker_class = "gevent"
-workers = 1
+import os
+
+# gevent worker with websocket upgrade support (gevent-websocket)
+worker_class = "geventwebsocket.gunicorn.workers.GeventWebSocketWorker"
+# More than 1 worker needs REDIS_URL (shared Socket.IO queue + rider
+# locations) and clients that stick to one worker (websocket transport
+# or a sticky load balancer), see Flask-SocketIO deployment docs
+workers = int(os.getenv("WEB_CONCURRENCY", 1))
 bind = "0.0.0.0:8080"
 timeout = 120
 keepalive = 5
+
+
+def post_worker_init(worker):
+    # After the worker loaded the app (and gevent patched threading):
+    # start this worker's breadcrumb writer and presence sweeper
+    from app import start_background_workers
+    start_background_workers()
@@ -0,0 +1,42 @@
+"""add daily_order_stats rollup table
+
+Revision ID: a4c1d7e9b2f0
+Revises: 9de6de0b17ff
+Create Date: 2026-10-18 10:12:41.218304
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4c1d7e9b2f0'
+down_revision = '9de6de0b17ff'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_order_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('restaurant_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('payment_type', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('items_total', sa.Float(), nullable=False),
+    sa.Column('delivery_total', sa.Float(), nullable=False),
+    sa.Column('coupon_discount', sa.Float(), nullable=False),
+    sa.Column('restaurant_offer_discount', sa.Float(), nullable=False),
+    sa.Column('grand_total', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('restaurant_id', 'day', 'payment_type', 'status', name='uq_daily_order_stats_key')
+    )
+    op.create_index('ix_daily_order_stats_day', 'daily_order_stats', ['day'], unique=False)
+
+    # Run `flask backfill-order-stats` afterwards to build history
+
+
+def downgrade():
+    op.drop_index('ix_daily_order_stats_day', table_name='daily_order_stats')
+    op.drop_table('daily_order_stats')
@@ -0,0 +1,29 @@
+"""index order.updated_at for the admin changes feed
+
+Revision ID: b7e3f2a91c5d
+Revises: a4c1d7e9b2f0
+Create Date: 2026-10-18 11:02:17.540913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e3f2a91c5d'
+down_revision = 'a4c1d7e9b2f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Older rows were written before updated_at was set on insert
+    op.execute('UPDATE "order" SET updated_at = created_at WHERE updated_at IS NULL')
+
+    with op.batch_alter_table('order', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_order_updated_at'), ['updated_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('order', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_order_updated_at'))
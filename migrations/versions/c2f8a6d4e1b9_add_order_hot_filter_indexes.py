@@ -0,0 +1,36 @@
+"""add indexes for the order table's hot filters
+
+Revision ID: c2f8a6d4e1b9
+Revises: b7e3f2a91c5d
+Create Date: 2026-10-18 11:40:05.318772
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2f8a6d4e1b9'
+down_revision = 'b7e3f2a91c5d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('order', schema=None) as batch_op:
+        batch_op.create_index('ix_order_restaurant_id_created_at', ['restaurant_id', 'created_at'], unique=False)
+        batch_op.create_index('ix_order_delivery_person_id_status', ['delivery_person_id', 'status'], unique=False)
+        batch_op.create_index('ix_order_phone_status', ['phone', 'status'], unique=False)
+        batch_op.create_index('ix_order_status', ['status'], unique=False)
+        batch_op.create_index('ix_order_device_fingerprint', ['device_fingerprint'], unique=False)
+        batch_op.create_index('ix_order_restaurant_offer_id', ['restaurant_offer_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('order', schema=None) as batch_op:
+        batch_op.drop_index('ix_order_restaurant_offer_id')
+        batch_op.drop_index('ix_order_device_fingerprint')
+        batch_op.drop_index('ix_order_status')
+        batch_op.drop_index('ix_order_phone_status')
+        batch_op.drop_index('ix_order_delivery_person_id_status')
+        batch_op.drop_index('ix_order_restaurant_id_created_at')
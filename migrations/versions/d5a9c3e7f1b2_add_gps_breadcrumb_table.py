@@ -0,0 +1,36 @@
+"""add gps_breadcrumb table
+
+Revision ID: d5a9c3e7f1b2
+Revises: c2f8a6d4e1b9
+Create Date: 2026-10-18 13:05:44.902166
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a9c3e7f1b2'
+down_revision = 'c2f8a6d4e1b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('gps_breadcrumb',
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('rider_id', sa.Integer(), nullable=True),
+    sa.Column('ts', sa.DateTime(), nullable=False),
+    sa.Column('lat', sa.Float(), nullable=False),
+    sa.Column('lng', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['order_id'], ['order.id'], ),
+    sa.ForeignKeyConstraint(['rider_id'], ['delivery_person.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_gps_breadcrumb_order_id_ts', 'gps_breadcrumb', ['order_id', 'ts'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_gps_breadcrumb_order_id_ts', table_name='gps_breadcrumb')
+    op.drop_table('gps_breadcrumb')
@@ -217,7 +217,7 @@ class Order(db.Model):
 
     # ---------------- TIMESTAMPS ----------------
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     delivered_time = db.Column(db.DateTime, nullable=True)
     not_delivered_time = db.Column(db.DateTime, nullable=True)
 
@@ -247,7 +247,18 @@ class Order(db.Model):
         default=0
     )
 
-    
+    # ---------------- INDEXES ----------------
+    # Match the hot filters: restaurant dashboards / reports, rider
+    # queues, customer history, fraud checks and offer usage
+    __table_args__ = (
+        db.Index("ix_order_restaurant_id_created_at", "restaurant_id", "created_at"),
+        db.Index("ix_order_delivery_person_id_status", "delivery_person_id", "status"),
+        db.Index("ix_order_phone_status", "phone", "status"),
+        db.Index("ix_order_status", "status"),
+        db.Index("ix_order_device_fingerprint", "device_fingerprint"),
+        db.Index("ix_order_restaurant_offer_id", "restaurant_offer_id"),
+    )
+
     # ---------------- HELPER FUNCTION ----------------
     def get_final_total(self):
         items_total = self.items_total or 0
@@ -505,3 +516,54 @@ class DeliverySettings(db.Model):
     is_night_surge_active = db.Column(db.Boolean, default=False)
 
     updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class DailyOrderStats(db.Model):
+    """
+    Per-day order rollup, kept up to date by services/order_rollup.py
+    whenever an Order is created or its status / payment / totals change.
+    """
+    __tablename__ = "daily_order_stats"
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    # Key (orders without a restaurant / payment type / status use 0 / "")
+    restaurant_id = db.Column(db.Integer, nullable=False, default=0)
+    day = db.Column(db.Date, nullable=False)            # Order.created_at (UTC) date
+    payment_type = db.Column(db.String(20), nullable=False, default="")
+    status = db.Column(db.String(50), nullable=False, default="")
+
+    # Totals for orders in this bucket
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    items_total = db.Column(db.Float, nullable=False, default=0.0)
+    delivery_total = db.Column(db.Float, nullable=False, default=0.0)
+    coupon_discount = db.Column(db.Float, nullable=False, default=0.0)
+    restaurant_offer_discount = db.Column(db.Float, nullable=False, default=0.0)
+    grand_total = db.Column(db.Float, nullable=False, default=0.0)  # sum of get_final_total()
+
+    __table_args__ = (
+        db.UniqueConstraint(
+            "restaurant_id", "day", "payment_type", "status",
+            name="uq_daily_order_stats_key"
+        ),
+        db.Index("ix_daily_order_stats_day", "day"),
+    )
+
+
+# ----------------- GPS Breadcrumb -----------------
+class GpsBreadcrumb(db.Model):
+    """
+    Rider position trail, written in batches by services/breadcrumbs.py.
+    """
+    __tablename__ = "gps_breadcrumb"
+
+    id = db.Column(db.BigInteger().with_variant(db.Integer, "sqlite"), primary_key=True)
+    order_id = db.Column(db.Integer, db.ForeignKey("order.id"), nullable=False)
+    rider_id = db.Column(db.Integer, db.ForeignKey("delivery_person.id"), nullable=True)
+    ts = db.Column(db.DateTime, nullable=False)     # UTC, when the server received the point
+    lat = db.Column(db.Float, nullable=False)
+    lng = db.Column(db.Float, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_gps_breadcrumb_order_id_ts", "order_id", "ts"),
+    )
@@ -0,0 +1,85 @@
+# scripts/bench_geo_index.py
+"""
+Home / city deliverability lookup: the old loop (scalar haversine against
+every restaurant on every page view) against the grid index in
+services/geo_index.py. Restaurants are spread at random over a
+Hyderabad-sized region with 3-10 km delivery radii; both sides must
+return the same restaurants for every user location.
+
+    python scripts/bench_geo_index.py [restaurants] [lookups]
+"""
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.geo_index import build_delivery_index, restaurants_delivering_to
+
+CENTER = (17.385, 78.486)
+SPREAD_DEG = 0.5
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    # app.py's per-restaurant helper before the index
+    lat1, lon1, lat2, lon2 = map(math.radians, map(float, [lat1, lon1, lat2, lon2]))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + \
+        math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 6371 * 2 * math.asin(math.sqrt(a))
+
+
+def lookup_old(rows, lat, lng):
+    delivering = {}
+    for restaurant_id, r_lat, r_lng, radius_km in rows:
+        dist = haversine(lat, lng, r_lat, r_lng)
+        if dist <= radius_km:
+            delivering[restaurant_id] = dist
+    return delivering
+
+
+def _point(rng):
+    return (
+        CENTER[0] + rng.uniform(-SPREAD_DEG, SPREAD_DEG),
+        CENTER[1] + rng.uniform(-SPREAD_DEG, SPREAD_DEG),
+    )
+
+
+def run(lookup, points):
+    timings = []
+    for lat, lng in points:
+        t = time.perf_counter()
+        lookup(lat, lng)
+        timings.append((time.perf_counter() - t) * 1000)
+    return statistics.median(timings), statistics.quantiles(timings, n=100)[98]
+
+
+def main():
+    restaurants = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    rng = random.Random(42)
+    rows = [(i, *_point(rng), rng.uniform(3, 10)) for i in range(1, restaurants + 1)]
+    points = [_point(rng) for _ in range(lookups)]
+
+    t = time.perf_counter()
+    build_delivery_index(rows)
+    build_ms = (time.perf_counter() - t) * 1000
+
+    for lat, lng in points:
+        old, new = lookup_old(rows, lat, lng), restaurants_delivering_to(lat, lng)
+        assert old.keys() == new.keys(), (lat, lng)
+
+    old_p50, old_p99 = run(lambda lat, lng: lookup_old(rows, lat, lng), points)
+    new_p50, new_p99 = run(restaurants_delivering_to, points)
+
+    print(f"{restaurants} restaurants, {lookups} lookups, index built in {build_ms:.0f} ms")
+    print(f"old: scalar loop   p50 {old_p50:8.3f} ms   p99 {old_p99:8.3f} ms")
+    print(f"new: grid index    p50 {new_p50:8.3f} ms   p99 {new_p99:8.3f} ms")
+    print(f"speedup (p50)      {old_p50 / new_p50:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# scripts/bench_haversine.py
+"""
+Distance kernel: the old scalar math haversine called once per point
+against services.geo.haversine_many over the same points in one NumPy
+pass. Checks both agree before timing.
+
+    python scripts/bench_haversine.py [repeats]
+"""
+import math
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from services.geo import haversine_many
+
+ORIGIN = (17.385, 78.486)
+SIZES = (100, 1_000, 10_000, 100_000)
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    # app.py's scalar helper before haversine_many
+    lat1, lon1, lat2, lon2 = map(math.radians, map(float, [lat1, lon1, lat2, lon2]))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + \
+        math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 6371 * 2 * math.asin(math.sqrt(a))
+
+
+def scalar_loop(lats, lngs):
+    return [haversine(ORIGIN[0], ORIGIN[1], lat, lng) for lat, lng in zip(lats, lngs)]
+
+
+def best_ms(fn, size, repeats):
+    number = max(1, 20_000 // size)
+    return min(timeit.repeat(fn, number=number, repeat=repeats)) / number * 1000
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    rng = random.Random(42)
+
+    for size in SIZES:
+        lats = [ORIGIN[0] + rng.uniform(-0.5, 0.5) for _ in range(size)]
+        lngs = [ORIGIN[1] + rng.uniform(-0.5, 0.5) for _ in range(size)]
+        lat_arr, lng_arr = np.array(lats), np.array(lngs)
+
+        assert np.allclose(scalar_loop(lats, lngs), haversine_many(*ORIGIN, lat_arr, lng_arr))
+
+        old = best_ms(lambda: scalar_loop(lats, lngs), size, repeats)
+        new = best_ms(lambda: haversine_many(*ORIGIN, lat_arr, lng_arr), size, repeats)
+        print(f"{size:>7} points   old {old:9.3f} ms   new {new:8.3f} ms   {old / new:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
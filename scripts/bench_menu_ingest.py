@@ -0,0 +1,92 @@
+# scripts/bench_menu_ingest.py
+"""
+Worker cold-start cost of menu ingestion: a fresh interpreter that
+imports the parser and parses one sheet, pandas.read_csv (the old
+menu()) against services/menu_ingest.py. Reports wall time and peak
+RSS per fresh process (median of runs); pandas must be installed for
+the "old" row. Linux only (/proc/self/status).
+
+    python scripts/bench_menu_ingest.py [runs] [rows]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r"""
+import json, sys, time
+started = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - started
+# VmHWM: this process's own peak RSS (ru_maxrss survives fork + exec)
+with open("/proc/self/status") as status:
+    hwm_kb = next(int(l.split()[1]) for l in status if l.startswith("VmHWM:"))
+print(json.dumps({{"ms": elapsed * 1000, "rss_mb": hwm_kb / 1024, "rows": rows}}))
+"""
+
+OLD = """
+import pandas as pd
+df = pd.read_csv(sys.argv[1])
+rows = len(df.to_dict(orient="records"))
+"""
+
+NEW = """
+sys.path.insert(0, {root!r})
+from services.menu_ingest import parse_menu_csv
+with open(sys.argv[1], newline="", encoding="utf-8") as f:
+    rows = len(list(parse_menu_csv(f)))
+"""
+
+BASELINE = """
+rows = 0
+"""
+
+
+def write_sheet(path, rows):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("name,price,category,description,availability\r\n")
+        for i in range(rows):
+            f.write(f"Item {i},{100 + i % 400},Category {i % 12},\"Tasty, fresh\",yes\r\n")
+
+
+def probe(body, sheet, runs):
+    results = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(body=body), sheet],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(out))
+    return (
+        statistics.median(r["ms"] for r in results),
+        statistics.median(r["rss_mb"] for r in results),
+        results[0]["rows"],
+    )
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sheet = os.path.join(tmp, "menu.csv")
+        write_sheet(sheet, rows)
+
+        variants = [("interpreter only", BASELINE), ("new: stdlib csv", NEW.format(root=ROOT))]
+        try:
+            import pandas  # noqa: F401
+            variants.insert(1, ("old: pandas", OLD))
+        except ImportError:
+            print("pandas not installed: old row skipped")
+
+        for label, body in variants:
+            ms, rss, parsed = probe(body, sheet, runs)
+            print(f"{label:18} {ms:8.1f} ms   peak RSS {rss:6.1f} MB   rows {parsed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# scripts/bench_place_order.py
+"""
+Order write path: the old place_order (commit the order, commit the
+order code, add + commit items one by one) against the current one
+(flush, bulk item INSERT, one commit). File-backed SQLite so commits
+cost what they cost; the rollup listener is active as in the app.
+
+    python scripts/bench_place_order.py [orders]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import insert
+
+from models import db, Order, OrderItem, Restaurant
+import services.order_rollup  # noqa: F401  rollup listener, as in app.py
+
+ITEMS = [("Chicken Biryani", 2, 220.0), ("Paneer 65", 1, 180.0), ("Coke", 3, 40.0)]
+
+
+def _new_order():
+    return Order(
+        restaurant_id=1, customer_name="Bench", phone="9000000000",
+        payment_type="COD", items_total=740.0, delivery_charge=30.0,
+        final_total=770.0, created_at=datetime.utcnow(),
+    )
+
+
+def place_old():
+    order = _new_order()
+    db.session.add(order)
+    db.session.commit()
+    order.order_id = f"ORD-{order.id}-{uuid.uuid4().hex[:6]}"
+    db.session.commit()
+    for name, qty, price in ITEMS:
+        db.session.add(OrderItem(order_id=order.id, item_name=name, quantity=qty, price=price))
+    db.session.commit()
+
+
+def place_new():
+    order = _new_order()
+    db.session.add(order)
+    db.session.flush()
+    order.order_id = f"ORD-{order.id}-{uuid.uuid4().hex[:6]}"
+    db.session.execute(insert(OrderItem), [
+        {"order_id": order.id, "item_name": name, "quantity": qty, "price": price}
+        for name, qty, price in ITEMS
+    ])
+    db.session.commit()
+
+
+def run(place, orders):
+    timings = []
+    started = time.perf_counter()
+    for _ in range(orders):
+        t = time.perf_counter()
+        place()
+        timings.append((time.perf_counter() - t) * 1000)
+    elapsed = time.perf_counter() - started
+    p99 = statistics.quantiles(timings, n=100)[98]
+    return orders / elapsed, statistics.median(timings), p99
+
+
+def main():
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    for label, place in (("old: 3 commits", place_old), ("new: 1 commit", place_new)):
+        with tempfile.TemporaryDirectory() as tmp:
+            app = Flask(__name__)
+            app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp}/bench.db"
+            db.init_app(app)
+            with app.app_context():
+                db.create_all()
+                db.session.add(Restaurant(id=1, name="Bench"))
+                db.session.commit()
+                rate, p50, p99 = run(place, orders)
+                db.session.remove()
+                db.engine.dispose()
+        print(f"{label:16} {rate:8.1f} orders/s   p50 {p50:6.2f} ms   p99 {p99:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# scripts/bench_socket_clients.py
+"""
+Connection scale of one gevent Socket.IO worker: N customers each hold a
+websocket to their order's tracking room (join_order_room, as in app.py)
+while every room gets location updates. Reports the server's memory per
+connection and how long an update takes to reach the clients.
+
+The server is a separate process with app.py's SocketIO settings
+(async_mode="gevent", gevent-websocket, in-memory tracking store, no
+Redis). The clients are raw Engine.IO websockets, one greenlet each, in
+this process; both run on the same machine, so latencies include client
+scheduling and are an upper bound.
+
+    python scripts/bench_socket_clients.py [clients] [rounds]
+"""
+from gevent import monkey
+monkey.patch_all()
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+import gevent
+from gevent.lock import Semaphore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PORT = 5099
+LAT, LNG = 17.385, 78.486
+# Concurrent handshakes while connecting, to stay under the listen backlog
+CONNECTING = 200
+
+
+def _vm_kb(field):
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+
+
+def serve(port):
+    from flask import Flask, request
+    from flask_socketio import SocketIO, emit, join_room
+
+    from services.tracking_store import init_tracking_store, last_location, save_last_location
+
+    app = Flask(__name__)
+    socketio = SocketIO(app, async_mode="gevent", ping_interval=25, ping_timeout=60)
+    init_tracking_store()
+
+    @socketio.on("join_order_room")
+    def join_order(data):
+        order_id = data["order_id"]
+        join_room(f"order_{order_id}")
+        location = last_location(order_id)
+        if location:
+            emit("delivery_location_update", {"lat": location[0], "lng": location[1]})
+
+    @app.route("/bench/rss")
+    def rss():
+        return {"rss_kb": _vm_kb("VmRSS")}
+
+    @app.route("/bench/tick", methods=["POST"])
+    def tick():
+        # One rider update per room, stamped so clients can time delivery
+        rooms = int(request.args["rooms"])
+        sent = time.time()
+        for order_id in range(rooms):
+            save_last_location(order_id, LAT, LNG)
+            socketio.emit(
+                "delivery_location_update",
+                {"lat": LAT, "lng": LNG, "sent": sent},
+                room=f"order_{order_id}",
+            )
+        return {"emit_ms": (time.time() - sent) * 1000}
+
+    socketio.run(app, host="127.0.0.1", port=port, log_output=False)
+
+
+def _http(path, method="GET"):
+    req = urllib.request.Request(f"http://127.0.0.1:{PORT}{path}", method=method)
+    with urllib.request.urlopen(req, timeout=60) as response:
+        return json.loads(response.read())
+
+
+class Client:
+    def __init__(self, order_id):
+        self.order_id = order_id
+        self.latencies = []
+        self.ws = None
+
+    def connect(self, gate):
+        import websocket
+
+        with gate:
+            self.ws = websocket.create_connection(
+                f"ws://127.0.0.1:{PORT}/socket.io/?EIO=4&transport=websocket", timeout=120
+            )
+            self.ws.recv()                      # Engine.IO open
+            self.ws.send("40")                  # Socket.IO connect
+            self.ws.recv()                      # 40{"sid": ...}
+            # join with ack id 0, wait for the ack so the room is joined
+            self.ws.send("420" + json.dumps(["join_order_room", {"order_id": self.order_id}]))
+            while not self.ws.recv().startswith("430"):
+                pass
+        gevent.spawn(self.listen)
+
+    def listen(self):
+        while True:
+            try:
+                packet = self.ws.recv()
+            except Exception:
+                return
+            received = time.time()
+            if packet == "2":
+                self.ws.send("3")               # Engine.IO pong
+            elif packet.startswith("42"):
+                event, data = json.loads(packet[2:])
+                if "sent" in data:
+                    self.latencies.append((received - data["sent"]) * 1000)
+
+
+def main():
+    if sys.argv[1:2] == ["--server"]:
+        return serve(PORT)
+
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    server = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--server"])
+    try:
+        for _ in range(100):
+            try:
+                idle_kb = _http("/bench/rss")["rss_kb"]
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            raise SystemExit("server did not start")
+
+        gate = Semaphore(CONNECTING)
+        pool = [Client(order_id) for order_id in range(clients)]
+        started = time.perf_counter()
+        gevent.joinall([gevent.spawn(c.connect, gate) for c in pool], raise_error=True)
+        connect_s = time.perf_counter() - started
+        gevent.sleep(1)
+        connected_kb = _http("/bench/rss")["rss_kb"]
+
+        emit_ms = []
+        for round_no in range(1, rounds + 1):
+            emit_ms.append(_http(f"/bench/tick?rooms={clients}", "POST")["emit_ms"])
+            deadline = time.time() + 30
+            while any(len(c.latencies) < round_no for c in pool) and time.time() < deadline:
+                gevent.sleep(0.05)
+            gevent.sleep(0.5)
+
+        latencies = [ms for c in pool for ms in c.latencies]
+        missing = clients * rounds - len(latencies)
+        cuts = statistics.quantiles(latencies, n=100)
+
+        print(f"{clients} clients connected + joined in {connect_s:.1f} s")
+        print(f"server RSS idle {idle_kb / 1024:.1f} MB, connected {connected_kb / 1024:.1f} MB, "
+              f"{(connected_kb - idle_kb) / clients:.1f} KB per connection")
+        print(f"{rounds} rounds x {clients} rooms: emit loop p50 {statistics.median(emit_ms):.0f} ms")
+        print(f"delivery latency p50 {cuts[49]:.0f} ms   p99 {cuts[98]:.0f} ms   "
+              f"max {max(latencies):.0f} ms   missed {missing}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# services/breadcrumbs.py
+import logging
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import insert, update
+
+from models import db, DeliveryPerson, GpsBreadcrumb, Order
+
+logger = logging.getLogger(__name__)
+
+# How often buffered points are written
+FLUSH_INTERVAL_SECONDS = 5
+# Upper bound on buffered points between flushes; oldest are dropped
+MAX_BUFFERED_POINTS = 50_000
+# How long a "rider is assigned to this order" answer is reused
+ASSIGNMENT_TTL_SECONDS = 30
+MAX_CACHED_ASSIGNMENTS = 10_000
+
+# Breadcrumb rows waiting for the next flush
+_points = []
+# rider_id -> {"id", "latitude", "longitude", "last_seen"}, newest only
+_riders = {}
+# (rider_id, order_id) -> (expires_at, assigned)
+_assignments = {}
+_writer_started = False
+_lock = threading.Lock()
+
+
+def rider_assigned(rider_id, order_id):
+    """
+    True if order_id is assigned to rider_id. One indexed lookup per
+    rider / order every ASSIGNMENT_TTL_SECONDS, not per location update.
+    """
+    now = time.monotonic()
+    key = (rider_id, order_id)
+    with _lock:
+        cached = _assignments.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    assigned = db.session.query(Order.id).filter(
+        Order.id == order_id,
+        Order.delivery_person_id == rider_id
+    ).first() is not None
+
+    with _lock:
+        if len(_assignments) > MAX_CACHED_ASSIGNMENTS:
+            _assignments.clear()
+        _assignments[key] = (now + ASSIGNMENT_TTL_SECONDS, assigned)
+    return assigned
+
+
+def record_point(order_id, rider_id, lat, lng):
+    # Called on the socket path with validated ids and floats: memory only
+    now = datetime.utcnow()
+    with _lock:
+        _points.append({
+            "order_id": order_id,
+            "rider_id": rider_id,
+            "ts": now,
+            "lat": lat,
+            "lng": lng,
+        })
+        if len(_points) > MAX_BUFFERED_POINTS:
+            del _points[:len(_points) - MAX_BUFFERED_POINTS]
+
+        _riders[rider_id] = {
+            "id": rider_id,
+            "latitude": lat,
+            "longitude": lng,
+            "last_seen": now,
+        }
+
+
+def _existing_ids(model, ids):
+    if not ids:
+        return set()
+    return {row_id for (row_id,) in db.session.query(model.id).filter(model.id.in_(ids))}
+
+
+def _write_rows(statement, rows):
+    # Each row in its own savepoint: only the rows that fail are lost
+    written = 0
+    for row in rows:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(statement, [row])
+        except Exception:
+            logger.warning("dropped breadcrumb row %r", row, exc_info=True)
+        else:
+            written += 1
+    return written
+
+
+def _write_row_by_row(points, riders):
+    # Fallback after a failed batch
+    written = _write_rows(insert(GpsBreadcrumb), points)
+    _write_rows(update(DeliveryPerson), riders)
+    db.session.commit()
+    return written
+
+
+def flush_breadcrumbs():
+    """
+    Writes everything buffered so far: one multi-row INSERT for the
+    trail and one bulk UPDATE (by primary key) for rider positions,
+    in a single commit. Points of orders / riders that no longer exist
+    are left out first; if the batch still fails it is retried row by
+    row. Returns the number of points written.
+    """
+    global _points, _riders
+    with _lock:
+        points, riders = _points, list(_riders.values())
+        _points, _riders = [], {}
+
+    if not points and not riders:
+        return 0
+
+    try:
+        order_ids = _existing_ids(Order, {p["order_id"] for p in points})
+        rider_ids = _existing_ids(
+            DeliveryPerson,
+            {p["rider_id"] for p in points} | {r["id"] for r in riders}
+        )
+        points = [
+            p for p in points
+            if p["order_id"] in order_ids and p["rider_id"] in rider_ids
+        ]
+        riders = [r for r in riders if r["id"] in rider_ids]
+
+        if points:
+            db.session.execute(insert(GpsBreadcrumb), points)
+        if riders:
+            db.session.execute(update(DeliveryPerson), riders)
+        db.session.commit()
+        return len(points)
+    except Exception:
+        db.session.rollback()
+        logger.exception("breadcrumb batch of %d points failed, retrying row by row", len(points))
+
+    try:
+        return _write_row_by_row(points, riders)
+    except Exception:
+        db.session.rollback()
+        logger.exception("dropped %d breadcrumb points", len(points))
+        return 0
+
+
+def _writer_loop(app):
+    while True:
+        time.sleep(FLUSH_INTERVAL_SECONDS)
+        with app.app_context():
+            flush_breadcrumbs()
+
+
+def start_breadcrumb_writer(app):
+    # One background writer per worker process
+    global _writer_started
+    with _lock:
+        if _writer_started:
+            return
+        _writer_started = True
+    threading.Thread(target=_writer_loop, args=(app,), daemon=True).start()
@@ -0,0 +1,63 @@
+# services/date_windows.py
+from datetime import datetime, time, timedelta
+
+import pytz
+
+IST = pytz.timezone("Asia/Kolkata")
+
+# Timestamps are stored as naive UTC (datetime.utcnow), so every window
+# is a half-open [start, end) pair of naive UTC datetimes. Filtering with
+# column >= start AND column < end keeps the column bare, so indexes on
+# created_at / delivered_time / updated_at can serve the range.
+
+
+def parse_day(value):
+    # "YYYY-MM-DD" -> date, None for missing / invalid input
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def day_window(day):
+    # One UTC calendar day
+    start = datetime.combine(day, time.min)
+    return start, start + timedelta(days=1)
+
+
+def ist_today():
+    return datetime.now(IST).date()
+
+
+def ist_day_window(day):
+    # One India-local calendar day, as UTC (a date picked in the UI)
+    start = IST.localize(datetime.combine(day, time.min))
+    end = IST.localize(datetime.combine(day + timedelta(days=1), time.min))
+    return (
+        start.astimezone(pytz.utc).replace(tzinfo=None),
+        end.astimezone(pytz.utc).replace(tzinfo=None),
+    )
+
+
+def days_window(from_day=None, to_day=None):
+    """
+    Inclusive day selection (from_day .. to_day) as [start, end).
+    Either side may be None for an open range.
+    """
+    start = datetime.combine(from_day, time.min) if from_day else None
+    end = datetime.combine(to_day + timedelta(days=1), time.min) if to_day else None
+    return start, end
+
+
+def within(column, window):
+    """
+    SQL filter conditions for column inside window, for use as
+    query.filter(*within(Order.created_at, window)).
+    """
+    start, end = window
+    conditions = []
+    if start is not None:
+        conditions.append(column >= start)
+    if end is not None:
+        conditions.append(column < end)
+    return conditions
@@ -0,0 +1,141 @@
+# services/exports.py
+import csv
+import io
+
+from sqlalchemy import func
+
+from models import db, Order, Restaurant, DeliveryPerson
+from services.date_windows import within
+
+# Rows fetched per round trip (server-side cursor on PostgreSQL)
+EXPORT_BATCH_SIZE = 1000
+
+GRAND_TOTAL = (
+    func.coalesce(Order.items_total, 0)
+    + func.coalesce(Order.delivery_charge, 0)
+    - func.coalesce(Order.discount, 0)
+    - func.coalesce(Order.restaurant_offer_discount, 0)
+)
+
+ORDER_HEADER = [
+    "Order ID", "Placed", "Restaurant", "Customer", "Phone", "Status",
+    "Payment", "Items Total", "Delivery", "Coupon Discount", "R-Offer",
+    "Grand Total",
+]
+
+COD_HEADER = [
+    "Delivery Person", "Order ID", "Delivered", "Payment", "Final Total",
+]
+
+
+def stream_csv(header, rows):
+    """
+    Yields a CSV document line by line; only one row is held at a time.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return value
+
+    # BOM so Excel opens the ₹ / Telugu text as UTF-8
+    writer.writerow(header)
+    yield "\ufeff" + flush()
+
+    for row in rows:
+        writer.writerow(row)
+        yield flush()
+
+
+# Leading characters Excel / Sheets treat as the start of a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _text(value):
+    # Free text (names, phones): quote would-be formulas so a customer
+    # called "=HYPERLINK(...)" stays a plain string in Excel
+    value = value or ""
+    if value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _money(value):
+    return f"{float(value or 0):.2f}"
+
+
+def _timestamp(value):
+    return value.strftime("%d-%m-%Y %H:%M") if value else ""
+
+
+def order_rows(restaurant_id=None, window=(None, None)):
+    """
+    One CSV row per order (restaurant and admin report exports),
+    oldest first, streamed with yield_per.
+    """
+    query = (
+        db.session.query(
+            Order.order_id,
+            Order.created_at,
+            Restaurant.name,
+            Order.customer_name,
+            Order.phone,
+            Order.status,
+            Order.payment_type,
+            Order.items_total,
+            Order.delivery_charge,
+            Order.discount,
+            Order.restaurant_offer_discount,
+            GRAND_TOTAL,
+        )
+        .outerjoin(Restaurant, Restaurant.id == Order.restaurant_id)
+        .filter(*within(Order.created_at, window))
+        .order_by(Order.id)
+    )
+    if restaurant_id:
+        query = query.filter(Order.restaurant_id == restaurant_id)
+
+    for row in query.yield_per(EXPORT_BATCH_SIZE):
+        (order_id, created_at, restaurant, customer, phone, status, payment,
+         items_total, delivery, discount, offer, grand_total) = row
+        yield [
+            order_id, _timestamp(created_at), _text(restaurant), _text(customer),
+            _text(phone), status, payment or "",
+            _money(items_total), _money(delivery), _money(discount),
+            _money(offer), _money(grand_total),
+        ]
+
+
+def cod_rows(restaurant_id, window):
+    """
+    One CSV row per delivered order in the window, grouped by rider
+    (the delivery_boys_cod_summary page, order by order).
+    """
+    final_total = (
+        func.coalesce(Order.items_total, 0)
+        + func.coalesce(Order.delivery_charge, 0)
+        - func.coalesce(Order.discount, 0)
+    )
+
+    query = (
+        db.session.query(
+            func.coalesce(DeliveryPerson.name, "Unassigned"),
+            Order.order_id,
+            Order.delivered_time,
+            Order.payment_type,
+            final_total,
+        )
+        .outerjoin(DeliveryPerson, DeliveryPerson.id == Order.delivery_person_id)
+        .filter(
+            Order.restaurant_id == restaurant_id,
+            Order.status == "Delivered",
+            *within(Order.delivered_time, window)
+        )
+        .order_by(DeliveryPerson.name, Order.delivered_time)
+    )
+
+    for rider, order_id, delivered_time, payment, total in query.yield_per(EXPORT_BATCH_SIZE):
+        yield [_text(rider), order_id, _timestamp(delivered_time), payment or "", _money(total)]
@@ -0,0 +1,41 @@
+# services/fragment_cache.py
+import threading
+import time
+from collections import OrderedDict
+
+# Max rendered fragments kept in memory (least recently used are evicted)
+FRAGMENT_CACHE_SIZE = 512
+# Trending items have no change event, so fragments also expire
+FRAGMENT_TTL_SECONDS = 120
+
+# key -> (expires_at, html), most recently used last
+_entries = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_fragment(key):
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return None
+        expires_at, html = entry
+        if time.monotonic() >= expires_at:
+            del _entries[key]
+            return None
+        _entries.move_to_end(key)
+        return html
+
+
+def put_fragment(key, html):
+    with _lock:
+        _entries[key] = (time.monotonic() + FRAGMENT_TTL_SECONDS, html)
+        _entries.move_to_end(key)
+        while len(_entries) > FRAGMENT_CACHE_SIZE:
+            _entries.popitem(last=False)
+    return html
+
+
+def invalidate_fragments():
+    # Restaurant, offer or trending item changed
+    with _lock:
+        _entries.clear()
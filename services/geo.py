@@ -0,0 +1,32 @@
+# services/geo.py
+import numpy as np
+
+EARTH_RADIUS_KM = 6371
+
+
+def haversine_many(lat, lng, lats, lngs):
+    """
+    Distance in km from one origin (lat, lng) to every point in the
+    lats / lngs arrays, computed in a single vectorized pass.
+    """
+    lat1 = np.radians(float(lat))
+    lng1 = np.radians(float(lng))
+    lat2 = np.radians(np.asarray(lats, dtype=float))
+    lng2 = np.radians(np.asarray(lngs, dtype=float))
+
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    return float(haversine_many(lat1, lng1, [lat2], [lng2])[0])
+
+
+def calculate_distance_km(lat1, lng1, lat2, lng2):
+    # Checkout / delivery-charge distance: 0 when a point is missing
+    if None in (lat1, lng1, lat2, lng2):
+        return 0
+    return round(haversine_km(lat1, lng1, lat2, lng2), 2)
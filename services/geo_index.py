@@ -0,0 +1,115 @@
+# services/geo_index.py
+import math
+import threading
+import time
+
+import numpy as np
+
+from models import db, Restaurant
+from services.geo import EARTH_RADIUS_KM, haversine_many
+
+# Grid cell size in degrees (~5.5 km of latitude)
+CELL_DEG = 0.05
+# Same sphere as haversine_many, so the box never undercuts its distances
+KM_PER_DEGREE = math.radians(1) * EARTH_RADIUS_KM
+# Safety net for other workers: rebuild at least this often
+INDEX_MAX_AGE_SECONDS = 300
+
+# (cell_lat, cell_lng) -> (ids, lats, lngs, radii) numpy arrays
+_cells = {}
+_built_at = None
+_lock = threading.Lock()
+
+
+def _cell(lat, lng):
+    return (math.floor(lat / CELL_DEG), math.floor(lng / CELL_DEG))
+
+
+def _covered_cells(lat, lng, radius_km):
+    # Bounding box of the delivery circle, in grid cells, padded by one
+    # cell for rounding and the wider longitude span away from the equator
+    dlat = radius_km / KM_PER_DEGREE
+    dlng = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+
+    lat_from, lng_from = _cell(lat - dlat, lng - dlng)
+    lat_to, lng_to = _cell(lat + dlat, lng + dlng)
+
+    for i in range(lat_from - 1, lat_to + 2):
+        for j in range(lng_from - 1, lng_to + 2):
+            yield (i, j)
+
+
+def build_delivery_index(rows):
+    """
+    rows: iterable of (id, latitude, longitude, delivery_radius_km).
+    Every restaurant is registered in each grid cell its delivery
+    circle touches, so a lookup only checks restaurants near the user.
+    """
+    global _cells, _built_at
+
+    cells = {}
+    for restaurant_id, lat, lng, radius_km in rows:
+        if lat is None or lng is None or not radius_km:
+            continue
+        point = (restaurant_id, float(lat), float(lng), float(radius_km))
+        for cell in _covered_cells(point[1], point[2], point[3]):
+            cells.setdefault(cell, []).append(point)
+
+    cells = {
+        cell: tuple(np.array(column) for column in zip(*points))
+        for cell, points in cells.items()
+    }
+
+    with _lock:
+        _cells = cells
+        _built_at = time.monotonic()
+
+
+def invalidate_delivery_index():
+    # Call after a restaurant's location or radius changes
+    global _built_at
+    with _lock:
+        _built_at = None
+
+
+def _ensure_built():
+    with _lock:
+        fresh = (
+            _built_at is not None
+            and time.monotonic() - _built_at < INDEX_MAX_AGE_SECONDS
+        )
+    if fresh:
+        return
+
+    build_delivery_index(
+        db.session.query(
+            Restaurant.id,
+            Restaurant.latitude,
+            Restaurant.longitude,
+            Restaurant.delivery_radius_km
+        ).all()
+    )
+
+
+def restaurants_delivering_to(lat, lng):
+    """
+    Returns {restaurant_id: distance_km} for every restaurant whose
+    delivery radius covers (lat, lng).
+    """
+    _ensure_built()
+    lat, lng = float(lat), float(lng)
+
+    with _lock:
+        candidates = _cells.get(_cell(lat, lng))
+
+    if candidates is None:
+        return {}
+
+    ids, lats, lngs, radii = candidates
+    distances = haversine_many(lat, lng, lats, lngs)
+    inside = distances <= radii
+
+    return {
+        int(restaurant_id): float(dist)
+        for restaurant_id, dist in zip(ids[inside], distances[inside])
+    }
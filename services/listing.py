@@ -0,0 +1,174 @@
+# services/listing.py
+import threading
+import time as _time
+from datetime import datetime, time, timedelta, timezone
+
+import pytz
+from sqlalchemy.orm import selectinload
+
+from models import Restaurant
+
+IST = pytz.timezone("Asia/Kolkata")
+
+# Rebuild at least this often, so edits made on another worker show up
+SNAPSHOT_MAX_AGE_SECONDS = 600
+
+# Restaurant columns the listing templates read
+CARD_FIELDS = [
+    "id", "name", "location", "status", "start_date",
+    "is_veg", "rating", "price_level", "delivery_time", "popular_items",
+    "delivery_charge", "free_delivery_limit",
+    "opening_time", "closing_time", "accept_orders_until",
+    "latitude", "longitude", "delivery_radius_km",
+]
+
+_snapshot = {
+    "version": 0,
+    "rebuild_at": 0,
+    "by_location": {},
+    "all_locations": [],
+}
+_lock = threading.Lock()
+
+
+def _next_after(now, t):
+    # Next wall-clock occurrence of time t strictly after now (same clock)
+    candidate = datetime.combine(now.date(), t)
+    if candidate <= now:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+def _restaurant_transitions(r, now_ist, now_local, now_utc):
+    """
+    Timestamps at which this restaurant's listing status can change:
+    - is_open and the card banners flip at opening / closing /
+      accept_orders_until (IST, as home() and the template use)
+    - can_accept_orders flips at opening / closing / accept_orders_until
+      and at midnight for coming-soon restaurants (server clock, as the
+      model property uses)
+    - the active offer starts / ends (UTC)
+    """
+    transitions = []
+
+    for t in (r.opening_time, r.closing_time, r.accept_orders_until):
+        if t:
+            transitions.append(IST.localize(_next_after(now_ist, t)).timestamp())
+
+    local_times = [r.opening_time, r.closing_time, r.accept_orders_until]
+    if r.status == "coming_soon" and r.start_date:
+        local_times.append(time(0, 0))
+    for t in local_times:
+        if t:
+            transitions.append(_next_after(now_local, t).timestamp())
+
+    for offer in r.offers:
+        for moment in (offer.start_date, offer.end_date):
+            if moment and moment > now_utc:
+                transitions.append(moment.replace(tzinfo=timezone.utc).timestamp())
+
+    return transitions
+
+
+def _status_key(card):
+    return (
+        not card["is_open"],                  # open first
+        not card["can_accept_orders"],        # active first
+        card["status"] == "suspended",        # suspended last
+        card["status"] == "coming_soon"       # coming soon after open
+    )
+
+
+def build_listing_snapshot():
+    now_ts = _time.time()
+    now_ist = datetime.now(IST).replace(tzinfo=None)
+    now_local = datetime.now()
+    now_utc = datetime.utcnow()
+
+    restaurants = Restaurant.query.options(selectinload(Restaurant.offers)).all()
+
+    cards = []
+    transitions = [now_ts + SNAPSHOT_MAX_AGE_SECONDS]
+
+    for r in restaurants:
+        card = {field: getattr(r, field) for field in CARD_FIELDS}
+        card["is_open"] = bool(
+            r.opening_time and r.closing_time
+            and r.opening_time <= now_ist.time() <= r.closing_time
+        )
+        card["can_accept_orders"] = r.can_accept_orders
+
+        offer = r.active_offer
+        card["active_offer"] = (
+            {"title": offer.title, "description": offer.description}
+            if offer else None
+        )
+
+        cards.append(card)
+        transitions.extend(_restaurant_transitions(r, now_ist, now_local, now_utc))
+
+    cards.sort(key=_status_key)
+
+    by_location = {"": cards}
+    for card in cards:
+        if card["location"]:
+            by_location.setdefault(card["location"], []).append(card)
+
+    global _snapshot
+    with _lock:
+        _snapshot = {
+            "version": _snapshot["version"] + 1,
+            # +1s: opening/closing checks are inclusive of the boundary second
+            "rebuild_at": min(transitions) + 1,
+            "by_location": by_location,
+            "all_locations": [loc for loc in by_location if loc],
+        }
+
+
+def invalidate_listing():
+    # Change event: restaurant card, status or offer edited
+    global _snapshot
+    with _lock:
+        _snapshot = dict(_snapshot, rebuild_at=0)
+
+
+def get_listing_snapshot():
+    """
+    Returns the current snapshot dict:
+    version, by_location {location: [card, ...]} ("" = all restaurants,
+    already sorted by status) and all_locations.
+    """
+    with _lock:
+        snapshot = _snapshot
+    if _time.time() >= snapshot["rebuild_at"]:
+        build_listing_snapshot()
+        with _lock:
+            snapshot = _snapshot
+    return snapshot
+
+
+def overlay_distance(cards, delivering, user_location_set):
+    """
+    Per-request step: copies each card with deliverable / distance for
+    this user and moves deliverable restaurants to the front, keeping
+    the snapshot's status order within each group.
+    """
+    deliverable = []
+    not_deliverable = []
+
+    for card in cards:
+        card = dict(card, deliverable=True, distance=None)
+
+        if (
+            user_location_set
+            and card["latitude"] is not None
+            and card["longitude"] is not None
+            and card["delivery_radius_km"]
+        ):
+            dist = delivering.get(card["id"])
+            card["distance"] = round(dist, 1) if dist is not None else None
+            card["deliverable"] = dist is not None
+
+        (deliverable if card["deliverable"] else not_deliverable).append(card)
+
+    return deliverable + not_deliverable
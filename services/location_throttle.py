@@ -0,0 +1,138 @@
+# services/location_throttle.py
+import threading
+import time
+
+from services.geo import haversine_km
+
+# Per rider: ignore updates closer together than this
+RIDER_MIN_INTERVAL_SECONDS = 1.0
+# Per rider: ignore moves shorter than this (GPS jitter)
+MIN_MOVE_METERS = 10
+# Per order room: at most this many broadcasts per second
+ROOM_MAX_BROADCASTS_PER_SECOND = 2
+# Rider / room state idle this long is pruned (riders that vanished
+# without a disconnect, orders never marked finished)
+STATE_IDLE_SECONDS = 60
+# Prune on every this many accepted updates
+PRUNE_EVERY = 256
+
+BROADCAST = "broadcast"   # emit now
+SCHEDULE = "schedule"     # emit the pending position after a delay
+QUEUED = "queued"         # folded into an already scheduled emit
+DROP = "drop"             # rate limited or jitter, ignore the point
+
+# rider_key -> (accepted_at, lat, lng)
+_riders = {}
+# order_id -> {"last_broadcast": t, "pending": (lat, lng) | None, "scheduled": bool}
+_rooms = {}
+_counters = {
+    "received": 0,
+    "dropped_rate": 0,
+    "dropped_jitter": 0,
+    "coalesced": 0,
+    "broadcast": 0,
+}
+_accepted_since_prune = 0
+_lock = threading.Lock()
+
+
+def _prune(now):
+    # Caller holds _lock
+    cutoff = now - STATE_IDLE_SECONDS
+    for key in [k for k, (accepted_at, _, _) in _riders.items() if accepted_at < cutoff]:
+        del _riders[key]
+    for key in [
+        k for k, room in _rooms.items()
+        if not room["scheduled"] and room["last_broadcast"] < cutoff
+    ]:
+        del _rooms[key]
+
+
+def accept_location(rider_key, order_id, lat, lng):
+    """
+    Ingestion step for one delivery_location_update.
+    Returns (action, delay_seconds):
+    - (BROADCAST, 0): send (lat, lng) to the order room now
+    - (SCHEDULE, delay): a flush should run after delay, then call
+      take_pending(order_id)
+    - (QUEUED, 0): kept as the newest position of a scheduled flush
+    - (DROP, 0): rate limited or jitter
+    """
+    global _accepted_since_prune
+    now = time.monotonic()
+    room_interval = 1.0 / ROOM_MAX_BROADCASTS_PER_SECOND
+
+    with _lock:
+        _counters["received"] += 1
+
+        previous = _riders.get(rider_key)
+        if previous:
+            accepted_at, prev_lat, prev_lng = previous
+            if now - accepted_at < RIDER_MIN_INTERVAL_SECONDS:
+                _counters["dropped_rate"] += 1
+                return DROP, 0
+            if haversine_km(prev_lat, prev_lng, lat, lng) * 1000 < MIN_MOVE_METERS:
+                _counters["dropped_jitter"] += 1
+                return DROP, 0
+        _riders[rider_key] = (now, lat, lng)
+
+        _accepted_since_prune += 1
+        if _accepted_since_prune >= PRUNE_EVERY:
+            _accepted_since_prune = 0
+            _prune(now)
+
+        room = _rooms.setdefault(
+            str(order_id),
+            {"last_broadcast": 0.0, "pending": None, "scheduled": False}
+        )
+
+        wait = room["last_broadcast"] + room_interval - now
+        if wait <= 0 and not room["scheduled"]:
+            room["last_broadcast"] = now
+            _counters["broadcast"] += 1
+            return BROADCAST, 0
+
+        # Too soon for this room: keep only the newest position
+        if room["pending"] is not None:
+            _counters["coalesced"] += 1
+        room["pending"] = (lat, lng)
+
+        if room["scheduled"]:
+            return QUEUED, 0
+        room["scheduled"] = True
+        return SCHEDULE, max(wait, 0)
+
+
+def take_pending(order_id):
+    """
+    Called by the scheduled flush. Returns the newest coalesced
+    (lat, lng) to broadcast, or None.
+    """
+    with _lock:
+        room = _rooms.get(str(order_id))
+        if not room:
+            return None
+        pending = room["pending"]
+        room["pending"] = None
+        room["scheduled"] = False
+        if pending is not None:
+            room["last_broadcast"] = time.monotonic()
+            _counters["broadcast"] += 1
+        return pending
+
+
+def forget_order(order_id):
+    # Order finished: drop its room state
+    with _lock:
+        _rooms.pop(str(order_id), None)
+
+
+def forget_rider(rider_key):
+    # Socket closed: drop the rider's throttle state
+    with _lock:
+        _riders.pop(rider_key, None)
+
+
+def tracking_counters():
+    with _lock:
+        return dict(_counters, riders=len(_riders), rooms=len(_rooms))
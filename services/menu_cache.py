@@ -0,0 +1,186 @@
+# services/menu_cache.py
+import io
+import threading
+import time
+from concurrent.futures import Future
+
+import requests
+
+from services.menu_ingest import parse_menu_csv
+
+# How long a parsed menu is served before a background refresh is kicked off
+MENU_TTL_SECONDS = 300
+# After a failed refresh, keep serving the stale menu and retry after this
+MENU_RETRY_SECONDS = 60
+FETCH_TIMEOUT_SECONDS = 10
+
+# restaurant_id -> {
+#     "sheet_url", "menu_by_category", "etag", "last_modified",
+#     "expires_at", "error"
+# }
+_entries = {}
+# (restaurant_id, sheet_url) -> Future of the download in progress;
+# concurrent callers wait on it instead of fetching the sheet again
+_inflight = {}
+_lock = threading.Lock()
+
+
+def group_by_category(items):
+    menu_by_category = {}
+    for item in items:
+        category = item.get("category", "Other")
+        menu_by_category.setdefault(category, []).append(item)
+    return menu_by_category
+
+
+def _download(sheet_url, etag=None, last_modified=None):
+    """
+    Fetches the sheet CSV, revalidating with ETag / Last-Modified.
+    Returns (menu_by_category or None if unchanged, etag, last_modified).
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    with requests.get(
+        sheet_url, headers=headers, timeout=FETCH_TIMEOUT_SECONDS
+    ) as response:
+        if response.status_code == 304:
+            return None, etag, last_modified
+        response.raise_for_status()
+
+        response.encoding = response.encoding or "utf-8"
+        items = parse_menu_csv(io.StringIO(response.text, newline=""))
+
+        return (
+            group_by_category(items),
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+
+
+def _refresh(restaurant_id, sheet_url):
+    """
+    Downloads the sheet once per restaurant at a time: the first caller
+    fetches, everyone arriving meanwhile waits for the same result.
+    """
+    key = (restaurant_id, sheet_url)
+    with _lock:
+        future = _inflight.get(key)
+        if future is not None:
+            owner = False
+        else:
+            owner = True
+            future = _inflight[key] = Future()
+
+    if not owner:
+        return future.result()
+
+    try:
+        menu_by_category = _fetch_into_cache(restaurant_id, sheet_url)
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(menu_by_category)
+        return menu_by_category
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+
+
+def _fetch_into_cache(restaurant_id, sheet_url):
+    with _lock:
+        entry = _entries.get(restaurant_id)
+        if entry is None or entry["sheet_url"] != sheet_url:
+            entry = {
+                "sheet_url": sheet_url,
+                "menu_by_category": None,
+                "etag": None,
+                "last_modified": None,
+                "expires_at": 0,
+                "error": None,
+            }
+            _entries[restaurant_id] = entry
+
+    try:
+        menu_by_category, etag, last_modified = _download(
+            sheet_url, entry["etag"], entry["last_modified"]
+        )
+    except Exception as e:
+        with _lock:
+            entry["error"] = str(e)
+            entry["expires_at"] = time.monotonic() + MENU_RETRY_SECONDS
+            has_menu = entry["menu_by_category"] is not None
+        print(f"[MENU CACHE] Refresh failed for restaurant {restaurant_id}: {e}")
+        if not has_menu:
+            raise
+        return entry["menu_by_category"]
+
+    with _lock:
+        if menu_by_category is not None:
+            entry["menu_by_category"] = menu_by_category
+            entry["etag"] = etag
+            entry["last_modified"] = last_modified
+        entry["expires_at"] = time.monotonic() + MENU_TTL_SECONDS
+        entry["error"] = None
+        return entry["menu_by_category"]
+
+
+def _refresh_in_background(restaurant_id, sheet_url):
+    with _lock:
+        if (restaurant_id, sheet_url) in _inflight:
+            return
+
+    def run():
+        try:
+            _refresh(restaurant_id, sheet_url)
+        except Exception:
+            pass  # already logged, stale menu keeps being served
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def get_menu(restaurant_id, sheet_url):
+    """
+    Returns the grouped menu for a restaurant.
+    Only the very first load of a restaurant waits for the download
+    (concurrent first loads share one download); after that the cached
+    menu is returned immediately, even when stale, and refreshed in the
+    background once it is older than MENU_TTL_SECONDS.
+    """
+    with _lock:
+        entry = _entries.get(restaurant_id)
+        if entry and entry["sheet_url"] != sheet_url:
+            entry = None
+        menu_by_category = entry["menu_by_category"] if entry else None
+        expired = entry is not None and time.monotonic() >= entry["expires_at"]
+
+    if menu_by_category is None:
+        return _refresh(restaurant_id, sheet_url)
+
+    if expired:
+        _refresh_in_background(restaurant_id, sheet_url)
+
+    return menu_by_category
+
+
+def invalidate_menu(restaurant_id, sheet_url=None):
+    """
+    Admin hook: marks a restaurant's menu as expired.
+    With a sheet_url the new menu is fetched in the background while the
+    old one keeps being served; without one the entry is dropped.
+    """
+    with _lock:
+        entry = _entries.get(restaurant_id)
+        if entry is None:
+            return
+        if not sheet_url or entry["sheet_url"] != sheet_url:
+            _entries.pop(restaurant_id, None)
+            return
+        entry["expires_at"] = 0
+
+    _refresh_in_background(restaurant_id, sheet_url)
+
@@ -0,0 +1,84 @@
+# services/menu_ingest.py
+import csv
+import io
+
+# Columns a sheet must have for its rows to be usable at all
+REQUIRED_COLUMNS = ("name", "price")
+
+# Columns menu.html reads for every item
+DEFAULT_FIELDS = {
+    "description": "",
+    "availability": "yes",
+}
+
+
+def _clean_header(name):
+    return (name or "").replace("\ufeff", "").strip()
+
+
+def missing_columns(text):
+    """
+    Required columns absent from the header line of a sheet CSV
+    (e.g. a renamed header, or an HTML login page served with 200).
+    """
+    header = next(csv.reader(io.StringIO(text, newline="")), [])
+    present = {_clean_header(name) for name in header}
+    return [column for column in REQUIRED_COLUMNS if column not in present]
+
+
+def parse_price(value):
+    """
+    Coerces a sheet price cell ("180", "₹180", "1,200.50") to a number:
+    int when whole (menu.html renders "₹180", as with pandas before),
+    float otherwise. Returns None when the cell is empty or not a number.
+    """
+    if value is None:
+        return None
+    value = str(value).replace("₹", "").replace(",", "").strip()
+    if not value:
+        return None
+    try:
+        price = float(value)
+    except ValueError:
+        return None
+    return int(price) if price.is_integer() else price
+
+
+def clean_row(row):
+    """
+    Normalises one CSV row into the record menu.html expects.
+    Returns None for rows that should be skipped (no name / bad price).
+    """
+    item = {}
+    for key, value in row.items():
+        if key is None:
+            continue  # extra cells without a header
+        item[_clean_header(key)] = value.strip() if isinstance(value, str) else value
+
+    if not item.get("name"):
+        return None
+
+    price = parse_price(item.get("price"))
+    if price is None:
+        return None
+    item["price"] = price
+
+    item["category"] = item.get("category") or "Other"
+    for field, default in DEFAULT_FIELDS.items():
+        if not item.get(field):
+            item[field] = default
+
+    return item
+
+
+def parse_menu_csv(lines):
+    """
+    Streams menu records out of CSV text (an open file, io.StringIO of
+    a response body, ...), one row at a time. Lines must keep their
+    endings so quoted multi-line cells survive. Invalid rows are skipped.
+    """
+    reader = csv.DictReader(lines)
+    for row in reader:
+        item = clean_row(row)
+        if item is not None:
+            yield item
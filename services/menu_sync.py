@@ -0,0 +1,180 @@
+# services/menu_sync.py
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import requests
+from sqlalchemy import delete, insert, update
+
+from models import db, Restaurant, MenuItem
+from services.menu_ingest import missing_columns, parse_menu_csv
+
+SYNC_FETCH_WORKERS = 8
+FETCH_TIMEOUT_SECONDS = 20
+# A sync may remove at most this fraction of a restaurant's menu...
+MAX_DELETE_FRACTION = 0.5
+# ...once the menu has at least this many items
+DELETE_CAP_MIN_ITEMS = 10
+
+# Progress of the last / running sync, read by the admin status endpoint
+_job = {
+    "running": False,
+    "started_at": None,
+    "finished_at": None,
+    "total": 0,
+    "done": 0,
+    "inserted": 0,
+    "updated": 0,
+    "deleted": 0,
+    "errors": [],
+}
+_lock = threading.Lock()
+
+
+def fetch_sheet_items(sheet_url):
+    with requests.get(sheet_url, timeout=FETCH_TIMEOUT_SECONDS) as response:
+        response.raise_for_status()
+        response.encoding = response.encoding or "utf-8"
+        text = response.text
+
+    missing = missing_columns(text)
+    if missing:
+        raise ValueError(f"sheet is missing columns: {', '.join(missing)}")
+    return list(parse_menu_csv(io.StringIO(text, newline="")))
+
+
+def diff_menu(existing, sheet_items, restaurant_id):
+    """
+    existing: {name: MenuItem row (id, name, price)} already in the DB
+    sheet_items: parsed sheet records
+    Returns (inserts, updates, delete_ids) ready for bulk statements.
+    """
+    wanted = {item["name"]: item["price"] for item in sheet_items}
+
+    inserts = [
+        {"restaurant_id": restaurant_id, "name": name, "price": price}
+        for name, price in wanted.items()
+        if name not in existing
+    ]
+    updates = [
+        {"id": existing[name].id, "price": price}
+        for name, price in wanted.items()
+        if name in existing and existing[name].price != price
+    ]
+    delete_ids = [row.id for name, row in existing.items() if name not in wanted]
+
+    return inserts, updates, delete_ids
+
+
+def apply_menu_diff(restaurant_id, sheet_items):
+    """
+    Writes the diff for one restaurant. Refuses (ValueError, nothing
+    written) when the sheet has no valid rows or would delete more than
+    MAX_DELETE_FRACTION of the menu, so one bad fetch cannot wipe it.
+    """
+    if not sheet_items:
+        raise ValueError("sheet has no valid rows, menu left unchanged")
+
+    rows = db.session.execute(
+        db.select(MenuItem.id, MenuItem.name, MenuItem.price)
+        .where(MenuItem.restaurant_id == restaurant_id)
+    ).all()
+    existing = {row.name: row for row in rows}
+
+    inserts, updates, delete_ids = diff_menu(existing, sheet_items, restaurant_id)
+
+    if (
+        len(existing) >= DELETE_CAP_MIN_ITEMS
+        and len(delete_ids) > len(existing) * MAX_DELETE_FRACTION
+    ):
+        raise ValueError(
+            f"sheet would delete {len(delete_ids)} of {len(existing)} items, "
+            "menu left unchanged"
+        )
+
+    if inserts:
+        db.session.execute(insert(MenuItem), inserts)
+    if updates:
+        db.session.execute(update(MenuItem), updates)
+    if delete_ids:
+        db.session.execute(delete(MenuItem).where(MenuItem.id.in_(delete_ids)))
+
+    db.session.commit()
+    return len(inserts), len(updates), len(delete_ids)
+
+
+def _progress(**changes):
+    with _lock:
+        for key, value in changes.items():
+            if key == "errors":
+                _job["errors"].extend(value)
+            elif key in ("done", "inserted", "updated", "deleted"):
+                _job[key] += value
+            else:
+                _job[key] = value
+
+
+def run_menu_sync(app):
+    with app.app_context():
+        restaurants = [
+            (r.id, r.name, r.sheet_url)
+            for r in db.session.execute(
+                db.select(Restaurant.id, Restaurant.name, Restaurant.sheet_url)
+                .where(Restaurant.sheet_url.isnot(None), Restaurant.sheet_url != "")
+            )
+        ]
+        _progress(total=len(restaurants))
+
+        try:
+            with ThreadPoolExecutor(max_workers=SYNC_FETCH_WORKERS) as pool:
+                futures = {
+                    pool.submit(fetch_sheet_items, sheet_url): (restaurant_id, name)
+                    for restaurant_id, name, sheet_url in restaurants
+                }
+                # DB writes stay on this thread, one restaurant at a time
+                for future in as_completed(futures):
+                    restaurant_id, name = futures[future]
+                    try:
+                        inserted, updated, deleted = apply_menu_diff(
+                            restaurant_id, future.result()
+                        )
+                    except Exception as e:
+                        db.session.rollback()
+                        print(f"[MENU SYNC] {name}: {e}")
+                        _progress(done=1, errors=[f"{name}: {e}"])
+                        continue
+
+                    _progress(done=1, inserted=inserted, updated=updated, deleted=deleted)
+        finally:
+            db.session.remove()
+            _progress(running=False, finished_at=datetime.utcnow().isoformat())
+
+
+def start_menu_sync(app):
+    """
+    Starts the sync in a background thread.
+    Returns False if a sync is already running.
+    """
+    with _lock:
+        if _job["running"]:
+            return False
+        _job.update(
+            running=True,
+            started_at=datetime.utcnow().isoformat(),
+            finished_at=None,
+            total=0,
+            done=0,
+            inserted=0,
+            updated=0,
+            deleted=0,
+            errors=[],
+        )
+
+    threading.Thread(target=run_menu_sync, args=(app,), daemon=True).start()
+    return True
+
+
+def menu_sync_status():
+    with _lock:
+        return dict(_job, errors=list(_job["errors"]))
@@ -0,0 +1,219 @@
+# services/order_feed.py
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import joinedload, selectinload
+
+from models import db, Order, Restaurant
+from services.date_windows import day_window
+from services.order_stats import ACTIVE_STATUSES
+
+# Most orders the live feed renders (today's + still active)
+LIVE_FEED_LIMIT = 200
+# Orders per "Load more" page of history
+HISTORY_PAGE_SIZE = 50
+HISTORY_MAX_PAGE_SIZE = 200
+
+# Not finished yet, whatever day they were placed
+OPEN_STATUSES = ["Pending", "Started", "Customer Not Available"] + ACTIVE_STATUSES
+
+
+def live_orders(restaurant_id, today):
+    """
+    Today's orders plus any older order that is still open, newest
+    first. Items are loaded in one extra query instead of per row.
+    """
+    return (
+        Order.query
+        .options(selectinload(Order.items))
+        .filter(
+            Order.restaurant_id == restaurant_id,
+            or_(
+                Order.created_at >= day_window(today)[0],
+                Order.status.in_(OPEN_STATUSES)
+            )
+        )
+        .order_by(Order.id.desc())
+        .limit(LIVE_FEED_LIMIT)
+        .all()
+    )
+
+
+def order_history(restaurant_id, today, before_id=None, limit=HISTORY_PAGE_SIZE):
+    """
+    One page of finished orders placed before today, newest first.
+    Keyset pagination on Order.id: pass the last id of the previous
+    page as before_id. Returns (orders, next_before_id or None).
+    """
+    limit = max(1, min(limit, HISTORY_MAX_PAGE_SIZE))
+
+    query = (
+        Order.query
+        .options(selectinload(Order.items))
+        .filter(
+            Order.restaurant_id == restaurant_id,
+            Order.created_at < day_window(today)[0],
+            ~Order.status.in_(OPEN_STATUSES)
+        )
+    )
+    if before_id:
+        query = query.filter(Order.id < before_id)
+
+    # One extra row tells us whether another page exists
+    orders = query.order_by(Order.id.desc()).limit(limit + 1).all()
+    next_before_id = orders[limit - 1].id if len(orders) > limit else None
+    return orders[:limit], next_before_id
+
+
+# Most rows one /api/admin/orders/changes call returns
+CHANGES_PAGE_SIZE = 200
+# updated_at comes from the app clock at flush time and transactions
+# commit out of order, so a row can appear with a timestamp the cursor
+# has already passed. Every poll re-sends this window behind the
+# cursor; the client dedupes by id.
+CHANGES_OVERLAP_SECONDS = 10
+
+
+def changes_cursor(updated_at, order_id):
+    # Opaque to the client: "<updated_at iso>_<id>"
+    if updated_at is None:
+        return ""
+    return f"{updated_at.isoformat()}_{order_id}"
+
+
+def parse_changes_cursor(cursor):
+    """
+    Returns (updated_at, id) or None for an empty / malformed cursor.
+    """
+    try:
+        moment, order_id = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(moment), int(order_id)
+    except (AttributeError, ValueError):
+        return None
+
+
+def latest_changes_cursor():
+    # Cursor for "everything up to now", rendered into the admin page
+    row = (
+        db.session.query(Order.updated_at, Order.id)
+        .filter(Order.updated_at.isnot(None))
+        .order_by(Order.updated_at.desc(), Order.id.desc())
+        .first()
+    )
+    return changes_cursor(*row) if row else ""
+
+
+def order_changes(cursor, limit=CHANGES_PAGE_SIZE):
+    """
+    Orders created or modified after the cursor, oldest change first,
+    as range scans on ix_order_updated_at, plus the orders of the last
+    CHANGES_OVERLAP_SECONDS behind the cursor (late commits). Returns
+    (orders, cursor) where cursor points at the last row after the old
+    cursor (or is unchanged); the overlap never moves it.
+    """
+    query = (
+        Order.query
+        .options(selectinload(Order.items), joinedload(Order.restaurant))
+        .filter(Order.updated_at.isnot(None))
+    )
+
+    since = parse_changes_cursor(cursor)
+    overlap = []
+    if since:
+        updated_at, order_id = since
+        after_cursor = or_(
+            Order.updated_at > updated_at,
+            and_(Order.updated_at == updated_at, Order.id > order_id)
+        )
+        overlap = (
+            query.filter(
+                Order.updated_at >= updated_at - timedelta(seconds=CHANGES_OVERLAP_SECONDS),
+                ~after_cursor
+            )
+            .order_by(Order.updated_at, Order.id)
+            .limit(limit)
+            .all()
+        )
+        query = query.filter(after_cursor)
+
+    orders = query.order_by(Order.updated_at, Order.id).limit(limit).all()
+    if orders:
+        cursor = changes_cursor(orders[-1].updated_at, orders[-1].id)
+    return overlap + orders, cursor
+
+
+def is_new_order(order, cursor, today):
+    """
+    True for an order placed today after the previous cursor: the admin
+    page prepends it to "Today" and rings. A change to an older order is
+    not new, even when its row is not on the page.
+    """
+    if order.created_at is None or order.created_at < day_window(today)[0]:
+        return False
+    since = parse_changes_cursor(cursor)
+    return since is None or order.created_at > since[0]
+
+
+# /api/admin-orders page size and NDJSON batch size
+EXPORT_PAGE_SIZE = 100
+EXPORT_MAX_PAGE_SIZE = 500
+
+
+def export_order_json(order, restaurant_name):
+    return {
+        "id": order.id,
+        "order_id": order.order_id,
+        "restaurant": restaurant_name,
+        "customer": order.customer_name,
+        "phone": order.phone,
+        "items": [
+            {
+                "name": i.item_name,
+                "qty": i.quantity,
+                "price": i.price
+            } for i in order.items
+        ],
+        "total": order.get_final_total(),
+        "status": order.status,
+        "time": order.created_at.strftime("%d-%m-%Y %H:%M") if order.created_at else None,
+    }
+
+
+def export_orders_page(after_id=None, limit=EXPORT_PAGE_SIZE):
+    """
+    One page of orders, newest first, as export dicts. Keyset on
+    Order.id: pass the last id of the previous page as after_id.
+    Restaurant names are joined in, items come in one selectin query.
+    Returns (orders, next_after_id or None).
+    """
+    limit = max(1, min(limit, EXPORT_MAX_PAGE_SIZE))
+
+    query = (
+        db.session.query(Order, Restaurant.name)
+        .outerjoin(Restaurant, Restaurant.id == Order.restaurant_id)
+        .options(selectinload(Order.items))
+    )
+    if after_id:
+        query = query.filter(Order.id < after_id)
+
+    rows = query.order_by(Order.id.desc()).limit(limit + 1).all()
+    more = len(rows) > limit
+    rows = rows[:limit]
+
+    orders = [export_order_json(order, name) for order, name in rows]
+    next_after_id = rows[-1][0].id if more else None
+    return orders, next_after_id
+
+
+def iter_export_orders(after_id=None, batch_size=EXPORT_MAX_PAGE_SIZE):
+    """
+    Yields export dicts for every order after after_id, fetching one
+    keyset page at a time so memory stays bounded by batch_size.
+    """
+    while True:
+        orders, after_id = export_orders_page(after_id, batch_size)
+        yield from orders
+        # Loaded rows are no longer needed once serialized
+        db.session.expunge_all()
+        if after_id is None:
+            return
@@ -0,0 +1,201 @@
+# services/order_rollup.py
+from datetime import date, datetime
+
+from sqlalchemy import delete, event, func, inspect, insert, select, update
+from sqlalchemy.orm import Session
+
+from models import db, Order, DailyOrderStats
+from services.order_stats import FINAL_TOTAL
+
+# Order columns that decide which bucket an order is in, or what it adds
+TRACKED_COLUMNS = (
+    "restaurant_id", "created_at", "payment_type", "status",
+    "items_total", "delivery_charge", "discount", "restaurant_offer_discount",
+)
+SUM_COLUMNS = (
+    "order_count", "items_total", "delivery_total",
+    "coupon_discount", "restaurant_offer_discount", "grand_total",
+)
+
+
+def _bucket(values):
+    """
+    values: dict of TRACKED_COLUMNS for one order.
+    Returns (key, amounts) where key is the rollup row key.
+    """
+    items_total = values["items_total"] or 0
+    delivery = values["delivery_charge"] or 0
+    discount = values["discount"] or 0
+
+    key = (
+        values["restaurant_id"] or 0,
+        values["created_at"].date(),
+        values["payment_type"] or "",
+        values["status"] or "",
+    )
+    amounts = (
+        1,
+        items_total,
+        delivery,
+        discount,
+        values["restaurant_offer_discount"] or 0,
+        round(items_total + delivery - discount, 2),  # Order.get_final_total()
+    )
+    return key, amounts
+
+
+def _add(deltas, values, sign):
+    if values["created_at"] is None:
+        return
+    key, amounts = _bucket(values)
+    current = deltas.setdefault(key, [0] * len(SUM_COLUMNS))
+    for i, amount in enumerate(amounts):
+        current[i] += sign * amount
+
+
+def _stored_values(connection, order_id):
+    # Row as it is in the DB before this flush, locked until commit so
+    # two concurrent changes to one order (restaurant and rider) cannot
+    # both subtract the same old bucket (no-op on SQLite)
+    columns = [getattr(Order, name) for name in TRACKED_COLUMNS]
+    row = connection.execute(
+        select(*columns).where(Order.id == order_id).with_for_update()
+    ).first()
+    return dict(zip(TRACKED_COLUMNS, row)) if row else None
+
+
+def _current_values(order):
+    return {name: getattr(order, name) for name in TRACKED_COLUMNS}
+
+
+def _upsert(connection, key, amounts):
+    table = DailyOrderStats.__table__
+    restaurant_id, day, payment_type, status = key
+    key_values = {
+        "restaurant_id": restaurant_id,
+        "day": day,
+        "payment_type": payment_type,
+        "status": status,
+    }
+    amount_values = dict(zip(SUM_COLUMNS, amounts))
+
+    dialect = connection.dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+        stmt = dialect_insert(table).values(**key_values, **amount_values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key_values),
+            set_={name: table.c[name] + stmt.excluded[name] for name in SUM_COLUMNS}
+        )
+        connection.execute(stmt)
+        return
+
+    # Other databases: update, insert if the bucket does not exist yet
+    result = connection.execute(
+        update(table)
+        .where(*(table.c[name] == value for name, value in key_values.items()))
+        .values({name: table.c[name] + amount_values[name] for name in SUM_COLUMNS})
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(**key_values, **amount_values))
+
+
+@event.listens_for(Session, "before_flush")
+def _rollup_before_flush(session, flush_context, instances):
+    deltas = {}
+    connection = None
+
+    for obj in session.new:
+        if isinstance(obj, Order):
+            # Resolve column defaults now so the rollup and the row agree
+            if obj.status is None:
+                obj.status = "Pending"
+            if obj.created_at is None:
+                obj.created_at = datetime.utcnow()
+            _add(deltas, _current_values(obj), +1)
+
+    for obj in session.dirty:
+        if not isinstance(obj, Order) or obj.id is None:
+            continue
+        state = inspect(obj)
+        if not any(state.attrs[name].history.has_changes() for name in TRACKED_COLUMNS):
+            continue
+        connection = connection or session.connection()
+        old = _stored_values(connection, obj.id)
+        if old:
+            _add(deltas, old, -1)
+        _add(deltas, _current_values(obj), +1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Order) and obj.id is not None:
+            connection = connection or session.connection()
+            old = _stored_values(connection, obj.id)
+            if old:
+                _add(deltas, old, -1)
+
+    deltas = {key: amounts for key, amounts in deltas.items() if any(amounts)}
+    if not deltas:
+        return
+
+    connection = connection or session.connection()
+    for key, amounts in deltas.items():
+        _upsert(connection, key, amounts)
+
+
+def backfill_daily_order_stats():
+    """
+    Rebuilds the whole rollup from Order in one grouped query.
+    Returns the number of rollup rows written.
+    """
+    items_total = func.coalesce(Order.items_total, 0)
+    delivery = func.coalesce(Order.delivery_charge, 0)
+    discount = func.coalesce(Order.discount, 0)
+    day = func.date(Order.created_at)
+
+    rows = (
+        db.session.query(
+            func.coalesce(Order.restaurant_id, 0),
+            day,
+            func.coalesce(Order.payment_type, ""),
+            func.coalesce(Order.status, ""),
+            func.count(Order.id),
+            func.sum(items_total),
+            func.sum(delivery),
+            func.sum(discount),
+            func.sum(func.coalesce(Order.restaurant_offer_discount, 0)),
+            func.sum(FINAL_TOTAL),
+        )
+        .filter(Order.created_at.isnot(None))
+        .group_by(
+            func.coalesce(Order.restaurant_id, 0),
+            day,
+            func.coalesce(Order.payment_type, ""),
+            func.coalesce(Order.status, ""),
+        )
+        .all()
+    )
+
+    records = []
+    for restaurant_id, row_day, payment_type, status, *amounts in rows:
+        if isinstance(row_day, str):  # SQLite returns date() as text
+            row_day = date.fromisoformat(row_day)
+        records.append({
+            "restaurant_id": restaurant_id,
+            "day": row_day,
+            "payment_type": payment_type,
+            "status": status,
+            **{
+                name: round(float(amount or 0), 2) if name != "order_count" else int(amount)
+                for name, amount in zip(SUM_COLUMNS, amounts)
+            },
+        })
+
+    db.session.execute(delete(DailyOrderStats))
+    if records:
+        db.session.execute(insert(DailyOrderStats), records)
+    db.session.commit()
+    return len(records)
@@ -0,0 +1,159 @@
+# services/order_stats.py
+from sqlalchemy import Numeric, case, cast, func
+
+from models import db, Order, Restaurant, DailyOrderStats
+
+# SQL twin of Order.get_final_total()
+FINAL_TOTAL = func.round(
+    cast(
+        func.coalesce(Order.items_total, 0)
+        + func.coalesce(Order.delivery_charge, 0)
+        - func.coalesce(Order.discount, 0),
+        Numeric
+    ),
+    2
+)
+
+
+def count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def sum_if(condition, value=FINAL_TOTAL):
+    return func.coalesce(func.sum(case((condition, value), else_=0)), 0)
+
+
+def money(value):
+    return round(float(value or 0), 2)
+
+
+def rollup_count_if(condition):
+    return func.coalesce(func.sum(case((condition, DailyOrderStats.order_count), else_=0)), 0)
+
+
+def rollup_sum_if(condition, value=DailyOrderStats.grand_total):
+    return func.coalesce(func.sum(case((condition, value), else_=0)), 0)
+
+
+def admin_order_stats(today, week_start):
+    """
+    The admin dashboard stats block. Everything except the "assigned"
+    count comes from one pass over the daily_order_stats rollup, so
+    the cost grows with days, not with orders.
+    """
+    R = DailyOrderStats
+    delivered = R.status == "Delivered"
+    delivered_today = delivered & (R.day == today)
+    delivered_this_week = delivered & (R.day >= week_start)
+
+    row = db.session.query(
+        func.coalesce(func.sum(R.order_count), 0).label("total_orders"),
+        rollup_count_if(R.status == "Pending").label("pending"),
+        rollup_count_if(R.status == "Preparing").label("preparing"),
+        rollup_count_if(delivered).label("delivered"),
+        rollup_count_if(R.status == "Cancelled").label("cancelled"),
+        rollup_count_if(delivered_today).label("total_orders_today"),
+        rollup_sum_if(delivered_today).label("total_revenue_today"),
+        rollup_count_if(R.day >= week_start).label("week_orders"),
+        rollup_sum_if(delivered).label("total_revenue"),
+        rollup_sum_if(delivered_this_week).label("weekly_revenue"),
+    ).one()
+
+    money_keys = ("total_revenue_today", "total_revenue", "weekly_revenue")
+    stats = {
+        key: money(value) if key in money_keys else int(value)
+        for key, value in row._asdict().items()
+    }
+
+    # Needs delivery_person_id, which the rollup does not carry
+    stats["assigned"] = Order.query.filter(
+        Order.delivery_person_id.isnot(None),
+        Order.status != "Delivered",
+        Order.status != "Cancelled"
+    ).count()
+
+    return stats
+
+
+def restaurant_performance(today, week_start):
+    """
+    Per-restaurant today / week / pending / completed figures for the
+    admin dashboard, in one grouped query over the rollup (restaurants
+    without orders are included with zeros).
+    """
+    R = DailyOrderStats
+    delivered = R.status == "Delivered"
+    delivered_today = delivered & (R.day == today)
+    delivered_this_week = delivered & (R.day >= week_start)
+
+    rows = (
+        db.session.query(
+            Restaurant.id,
+            Restaurant.name,
+            rollup_count_if(delivered_today).label("today_orders"),
+            rollup_sum_if(delivered_today).label("today_earnings"),
+            rollup_count_if(delivered_this_week).label("weekly_orders"),
+            rollup_sum_if(delivered_this_week).label("weekly_earnings"),
+            rollup_count_if(R.status == "Pending").label("pending"),
+            rollup_count_if(delivered).label("completed"),
+        )
+        .outerjoin(R, R.restaurant_id == Restaurant.id)
+        .group_by(Restaurant.id, Restaurant.name)
+        .order_by(Restaurant.id)
+        .all()
+    )
+
+    return [
+        {
+            "id": row.id,
+            "name": row.name,
+            "today_orders": int(row.today_orders),
+            "today_earnings": money(row.today_earnings),
+            "weekly_orders": int(row.weekly_orders),
+            "weekly_earnings": money(row.weekly_earnings),
+            "pending": int(row.pending),
+            "completed": int(row.completed),
+        }
+        for row in rows
+    ]
+
+
+ACTIVE_STATUSES = ["Accepted", "Preparing", "Ready", "Out for Delivery"]
+
+
+def restaurant_dashboard_stats(restaurant_id, today, week_ago):
+    """
+    Stats cards on the restaurant dashboard, from the rollup rows of
+    the last week plus any day that still has active orders.
+    """
+    R = DailyOrderStats
+    delivered = R.status == "Delivered"
+    delivered_today = delivered & (R.day == today)
+    delivered_this_week = delivered & (R.day >= week_ago)
+
+    row = (
+        db.session.query(
+            rollup_count_if(R.day == today).label("today_orders"),
+            rollup_count_if(delivered_today).label("delivered_today"),
+            rollup_count_if((R.day == today) & (R.status == "Pending")).label("pending_today"),
+            rollup_count_if((R.day == today) & (R.status == "Cancelled")).label("cancelled_today"),
+            rollup_count_if(R.status.in_(ACTIVE_STATUSES)).label("active_orders"),
+            rollup_sum_if(delivered_today).label("today_earnings"),
+            rollup_sum_if(delivered_today & (R.payment_type == "COD")).label("today_cod_amount"),
+            rollup_sum_if(delivered_today & (R.payment_type == "Online")).label("today_online_amount"),
+            rollup_count_if(R.day >= week_ago).label("weekly_orders"),
+            rollup_sum_if(delivered_this_week).label("weekly_earnings"),
+            rollup_count_if(delivered_this_week).label("weekly_delivered_orders"),
+        )
+        .filter(
+            R.restaurant_id == restaurant_id,
+            (R.day >= week_ago) | R.status.in_(ACTIVE_STATUSES)
+        )
+        .one()
+    )
+
+    money_keys = ("today_earnings", "today_cod_amount", "today_online_amount", "weekly_earnings")
+    return {
+        key: money(value) if key in money_keys else int(value)
+        for key, value in row._asdict().items()
+    }
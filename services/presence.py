@@ -0,0 +1,207 @@
+# services/presence.py
+import logging
+import threading
+import time
+from datetime import datetime
+
+import redis
+from sqlalchemy import update
+
+from models import db, DeliveryPerson, RestaurantDelivery
+
+logger = logging.getLogger(__name__)
+
+# A rider is offline once no heartbeat / location arrived for this long
+PRESENCE_TIMEOUT_SECONDS = 90
+# How often the sweeper looks for expired riders
+SWEEP_INTERVAL_SECONDS = 15
+
+EXPIRES_KEY = "presence:expires"            # ZSET rider_id -> expires_at
+CONNECTIONS_KEY = "presence:connections"    # HASH rider_id -> open sockets
+RESTAURANT_KEY = "presence:restaurant:"     # SET of rider ids per restaurant
+
+# Redis client shared by all workers, or None for the in-process store
+_redis = None
+
+# In-process store, same layout as Redis. Open sockets are counted
+# apart from expiry: a timeout or heartbeat never touches the count
+_expires = {}        # rider_id -> expires_at
+_connections = {}    # rider_id -> open sockets
+# restaurant_id -> {rider_id, ...}
+_restaurants = {}
+_sweeper_started = False
+_lock = threading.Lock()
+
+
+def init_presence(redis_url=None, client=None):
+    global _redis
+    if client is not None:
+        _redis = client
+    elif redis_url:
+        _redis = redis.Redis.from_url(redis_url)
+    else:
+        _redis = None
+
+    with _lock:
+        _expires.clear()
+        _connections.clear()
+        _restaurants.clear()
+
+
+def rider_restaurant_ids(rider_id):
+    # Restaurants a rider works for (home restaurant + assignments)
+    ids = {
+        restaurant_id
+        for (restaurant_id,) in db.session.query(RestaurantDelivery.restaurant_id)
+        .filter(RestaurantDelivery.delivery_person_id == rider_id)
+    }
+    home = db.session.query(DeliveryPerson.restaurant_id).filter_by(id=rider_id).scalar()
+    if home:
+        ids.add(home)
+    return ids
+
+
+def rider_connected(rider_id, restaurant_ids):
+    """
+    A rider socket connected. Returns True if the rider just came online.
+    """
+    expires_at = time.time() + PRESENCE_TIMEOUT_SECONDS
+
+    if _redis is not None:
+        pipe = _redis.pipeline()
+        # ZADD returns 1 only when the rider was not in the set (offline)
+        pipe.zadd(EXPIRES_KEY, {rider_id: expires_at})
+        pipe.hincrby(CONNECTIONS_KEY, rider_id, 1)
+        for restaurant_id in restaurant_ids:
+            pipe.sadd(f"{RESTAURANT_KEY}{restaurant_id}", rider_id)
+        added, *_ = pipe.execute()
+        return added == 1
+
+    with _lock:
+        came_online = rider_id not in _expires
+        _expires[rider_id] = expires_at
+        _connections[rider_id] = _connections.get(rider_id, 0) + 1
+        for restaurant_id in restaurant_ids:
+            _restaurants.setdefault(restaurant_id, set()).add(rider_id)
+        return came_online
+
+
+def rider_heartbeat(rider_id):
+    """
+    Heartbeat or location ping from a connected rider. Returns True if
+    the rider had already expired and is back online. Only the expiry
+    moves; the open-socket count belongs to connect / disconnect.
+    """
+    expires_at = time.time() + PRESENCE_TIMEOUT_SECONDS
+
+    if _redis is not None:
+        return _redis.zadd(EXPIRES_KEY, {rider_id: expires_at}) == 1
+
+    with _lock:
+        came_back = rider_id not in _expires
+        _expires[rider_id] = expires_at
+        return came_back
+
+
+def rider_disconnected(rider_id):
+    """
+    A rider socket closed. Returns True if that was the rider's last
+    connection, i.e. the rider just went offline.
+    """
+    if _redis is not None:
+        if _redis.hincrby(CONNECTIONS_KEY, rider_id, -1) > 0:
+            return False
+        _redis.hdel(CONNECTIONS_KEY, rider_id)
+        # Only the worker that removes the rider reports the transition
+        return _redis.zrem(EXPIRES_KEY, rider_id) == 1
+
+    with _lock:
+        connections = _connections.get(rider_id, 0) - 1
+        if connections > 0:
+            _connections[rider_id] = connections
+            return False
+        _connections.pop(rider_id, None)
+        return _expires.pop(rider_id, None) is not None
+
+
+def expire_riders():
+    """
+    Removes riders whose heartbeat timed out. Returns their ids.
+    Their socket counts are kept: a heartbeat on a still-open socket
+    brings them back, and its disconnect is still counted.
+    """
+    now = time.time()
+
+    if _redis is not None:
+        expired = []
+        for member in _redis.zrangebyscore(EXPIRES_KEY, "-inf", now):
+            if _redis.zrem(EXPIRES_KEY, member) == 1:
+                expired.append(int(member))
+        return expired
+
+    with _lock:
+        expired = [r for r, expires_at in _expires.items() if expires_at <= now]
+        for rider_id in expired:
+            del _expires[rider_id]
+        return expired
+
+
+def online_rider_ids(restaurant_id):
+    """
+    Ids of this restaurant's riders that are online right now.
+    Served from the presence store, no database query.
+    """
+    now = time.time()
+
+    if _redis is not None:
+        members = list(_redis.smembers(f"{RESTAURANT_KEY}{restaurant_id}"))
+        if not members:
+            return set()
+        pipe = _redis.pipeline()
+        for member in members:
+            pipe.zscore(EXPIRES_KEY, member)
+        return {
+            int(member)
+            for member, expires_at in zip(members, pipe.execute())
+            if expires_at is not None and expires_at > now
+        }
+
+    with _lock:
+        return {
+            rider_id
+            for rider_id in _restaurants.get(restaurant_id, ())
+            if _expires.get(rider_id, 0) > now
+        }
+
+
+def persist_presence(rider_ids, is_online):
+    # Transitions only: one bulk UPDATE by primary key
+    if not rider_ids:
+        return
+    now = datetime.utcnow()
+    db.session.execute(
+        update(DeliveryPerson),
+        [{"id": rider_id, "is_online": is_online, "last_seen": now} for rider_id in rider_ids]
+    )
+    db.session.commit()
+
+
+def _sweeper_loop(app):
+    while True:
+        time.sleep(SWEEP_INTERVAL_SECONDS)
+        with app.app_context():
+            try:
+                persist_presence(expire_riders(), False)
+            except Exception:
+                db.session.rollback()
+                logger.exception("presence sweep failed")
+
+
+def start_presence_sweeper(app):
+    # One sweeper per worker process
+    global _sweeper_started
+    with _lock:
+        if _sweeper_started:
+            return
+        _sweeper_started = True
+    threading.Thread(target=_sweeper_loop, args=(app,), daemon=True).start()
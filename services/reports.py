@@ -0,0 +1,233 @@
+# services/reports.py
+from datetime import date, datetime
+
+from sqlalchemy import Date, cast, func
+
+from models import db, Order, OrderItem, Restaurant
+from services.date_windows import within
+from services.order_stats import count_if, sum_if
+
+PERIODS = ("day", "week", "month")
+
+# Money columns summed over delivered orders, in report order
+MONEY_FIELDS = (
+    "items_total", "delivery_total",
+    "coupon_discount_total", "restaurant_offer_total",
+)
+
+
+def period_bucket(column, period, dialect):
+    """
+    SQL expression truncating a timestamp column to the start of its
+    day / week (Monday) / month, as a date.
+    """
+    if period not in PERIODS:
+        period = "day"
+
+    if dialect == "sqlite":
+        if period == "week":
+            # Next Sunday (or today), back six days -> Monday
+            return func.date(column, "weekday 0", "-6 days")
+        if period == "month":
+            return func.date(column, "start of month")
+        return func.date(column)
+
+    # PostgreSQL and other date_trunc dialects (weeks start on Monday)
+    return cast(func.date_trunc(period, column), Date)
+
+
+def _as_date(value):
+    # SQLite returns date() as text
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def admin_report(restaurant_id=None, window=(None, None), period="day"):
+    """
+    Per-restaurant, per-period rows plus the per-restaurant summary,
+    from one grouped scan of Order. The summary is folded from the
+    period rows, so the orders are never read twice.
+    Returns (reports, summary), both lists of dicts.
+    """
+    dialect = db.session.get_bind().dialect.name
+    bucket = period_bucket(Order.created_at, period, dialect).label("period")
+    delivered = Order.status == "Delivered"
+
+    query = (
+        db.session.query(
+            Restaurant.id,
+            Restaurant.name.label("restaurant"),
+            bucket,
+            func.count(Order.id).label("total_orders"),
+            count_if(delivered).label("delivered"),
+            count_if(Order.status == "Cancelled").label("cancelled"),
+            sum_if(delivered, func.coalesce(Order.items_total, 0)).label("items_total"),
+            sum_if(delivered, func.coalesce(Order.delivery_charge, 0)).label("delivery_total"),
+            sum_if(delivered, func.coalesce(Order.discount, 0)).label("coupon_discount_total"),
+            sum_if(delivered, func.coalesce(Order.restaurant_offer_discount, 0)).label("restaurant_offer_total"),
+        )
+        .join(Order, Order.restaurant_id == Restaurant.id)
+        .filter(Order.created_at.isnot(None), *within(Order.created_at, window))
+        .group_by(Restaurant.id, Restaurant.name, bucket)
+    )
+    if restaurant_id:
+        query = query.filter(Order.restaurant_id == restaurant_id)
+
+    reports = []
+    summary = {}
+
+    for row in query.all():
+        report = row._asdict()
+        report["period"] = _as_date(report["period"])
+        for field in MONEY_FIELDS:
+            report[field] = float(report[field] or 0)
+        reports.append(report)
+
+        total = summary.setdefault(row.id, {
+            "restaurant": row.restaurant,
+            **{field: 0.0 for field in MONEY_FIELDS},
+        })
+        for field in MONEY_FIELDS:
+            total[field] += report[field]
+
+    reports.sort(key=lambda r: r["restaurant"])
+    reports.sort(key=lambda r: r["period"], reverse=True)
+
+    for total in summary.values():
+        total["total_earning"] = (
+            total["items_total"] + total["delivery_total"]
+            - total["coupon_discount_total"] - total["restaurant_offer_total"]
+        )
+
+    return reports, sorted(summary.values(), key=lambda s: s["restaurant"])
+
+
+# Keys of restaurant_report()'s totals / daywise rows (template names)
+RESTAURANT_MONEY_FIELDS = (
+    "items_total", "delivery_total",
+    "coupon_discount", "restaurant_offer_discount",
+)
+
+
+def restaurant_report(restaurant_id, window=(None, None)):
+    """
+    Restaurant earnings report from stored Order totals, one grouped
+    query per view (no per-order item loading). Money only counts
+    delivered orders; grand total also takes off the restaurant offer.
+    Returns a dict of totals plus "daywise" {"dd-mm-YYYY": {...}}.
+    """
+    dialect = db.session.get_bind().dialect.name
+    bucket = period_bucket(Order.created_at, "day", dialect).label("day")
+    delivered = Order.status == "Delivered"
+    grand_total = (
+        func.coalesce(Order.items_total, 0)
+        + func.coalesce(Order.delivery_charge, 0)
+        - func.coalesce(Order.discount, 0)
+        - func.coalesce(Order.restaurant_offer_discount, 0)
+    )
+
+    rows = (
+        db.session.query(
+            bucket,
+            func.count(Order.id).label("orders"),
+            count_if(delivered).label("delivered"),
+            count_if(Order.status == "Cancelled").label("cancelled"),
+            sum_if(delivered, func.coalesce(Order.items_total, 0)).label("items_total"),
+            sum_if(delivered, func.coalesce(Order.delivery_charge, 0)).label("delivery_total"),
+            sum_if(delivered, func.coalesce(Order.discount, 0)).label("coupon_discount"),
+            sum_if(delivered, func.coalesce(Order.restaurant_offer_discount, 0)).label("restaurant_offer_discount"),
+            sum_if(delivered, grand_total).label("grand_total"),
+            sum_if(delivered & (Order.payment_type == "COD"), grand_total).label("cod_amount"),
+        )
+        .filter(
+            Order.restaurant_id == restaurant_id,
+            Order.created_at.isnot(None),
+            *within(Order.created_at, window)
+        )
+        .group_by(bucket)
+        .order_by(bucket)
+        .all()
+    )
+
+    report = {
+        "total_orders": 0,
+        "delivered_orders": 0,
+        "cancelled_orders": 0,
+        **{f"total_{field}": 0.0 for field in RESTAURANT_MONEY_FIELDS},
+        "total_earnings": 0.0,
+        "cod_amount": 0.0,
+        "daywise": {},
+    }
+
+    for row in rows:
+        day = {
+            "orders": int(row.orders),
+            "delivered": int(row.delivered),
+            "cancelled": int(row.cancelled),
+            **{field: float(getattr(row, field) or 0) for field in RESTAURANT_MONEY_FIELDS},
+            "grand_total": float(row.grand_total or 0),
+        }
+        report["daywise"][_as_date(row.day).strftime("%d-%m-%Y")] = day
+
+        report["total_orders"] += day["orders"]
+        report["delivered_orders"] += day["delivered"]
+        report["cancelled_orders"] += day["cancelled"]
+        for field in RESTAURANT_MONEY_FIELDS:
+            report[f"total_{field}"] += day[field]
+        report["total_earnings"] += day["grand_total"]
+        report["cod_amount"] += float(row.cod_amount or 0)
+
+    report["online_amount"] = report["total_earnings"] - report["cod_amount"]
+    return report
+
+
+def items_total_mismatches(restaurant_id=None, window=(None, None), tolerance=0.01):
+    """
+    Consistency check, meant for a batch job: orders whose stored
+    items_total differs from the sum of their line items by more than
+    tolerance. Returns a list of dicts (id, order_id, restaurant_id,
+    stored, computed).
+    """
+    line_totals = (
+        db.session.query(
+            OrderItem.order_id.label("order_id"),
+            func.sum(
+                func.coalesce(OrderItem.quantity, 0) * func.coalesce(OrderItem.price, 0)
+            ).label("computed")
+        )
+        .group_by(OrderItem.order_id)
+        .subquery()
+    )
+    computed = func.coalesce(line_totals.c.computed, 0)
+
+    query = (
+        db.session.query(
+            Order.id,
+            Order.order_id,
+            Order.restaurant_id,
+            func.coalesce(Order.items_total, 0).label("stored"),
+            computed.label("computed"),
+        )
+        .outerjoin(line_totals, line_totals.c.order_id == Order.id)
+        .filter(
+            func.abs(func.coalesce(Order.items_total, 0) - computed) > tolerance,
+            *within(Order.created_at, window)
+        )
+        .order_by(Order.id)
+    )
+    if restaurant_id:
+        query = query.filter(Order.restaurant_id == restaurant_id)
+
+    return [
+        {
+            "id": row.id,
+            "order_id": row.order_id,
+            "restaurant_id": row.restaurant_id,
+            "stored": round(float(row.stored), 2),
+            "computed": round(float(row.computed), 2),
+        }
+        for row in query.all()
+    ]
@@ -0,0 +1,75 @@
+# services/tracking_store.py
+import json
+import threading
+import time
+
+import redis
+
+# A rider's last position is dropped this long after its last update
+LOCATION_TTL_SECONDS = 2 * 60 * 60
+KEY_PREFIX = "tracking:last_location:"
+
+# Redis client shared by all workers, or None for the in-process store
+_redis = None
+
+# order_id -> (expires_at, lat, lng), single-worker fallback
+_memory = {}
+_lock = threading.Lock()
+
+
+def init_tracking_store(redis_url=None, client=None):
+    """
+    Picks the backend: an explicit client (e.g. fakeredis in tests),
+    a Redis URL, or the in-memory store when neither is given.
+    """
+    global _redis
+    if client is not None:
+        _redis = client
+    elif redis_url:
+        _redis = redis.Redis.from_url(redis_url)
+    else:
+        _redis = None
+
+    with _lock:
+        _memory.clear()
+
+
+def _key(order_id):
+    return f"{KEY_PREFIX}{order_id}"
+
+
+def save_last_location(order_id, lat, lng):
+    order_id = str(order_id)
+
+    if _redis is not None:
+        _redis.set(_key(order_id), json.dumps([lat, lng]), ex=LOCATION_TTL_SECONDS)
+        return
+
+    now = time.monotonic()
+    with _lock:
+        _memory[order_id] = (now + LOCATION_TTL_SECONDS, lat, lng)
+        # Cheap sweep so finished orders do not pile up
+        if len(_memory) % 256 == 0:
+            for key in [k for k, v in _memory.items() if v[0] <= now]:
+                del _memory[key]
+
+
+def last_location(order_id):
+    """
+    Returns (lat, lng) or None if unknown / expired.
+    """
+    order_id = str(order_id)
+
+    if _redis is not None:
+        value = _redis.get(_key(order_id))
+        return tuple(json.loads(value)) if value else None
+
+    with _lock:
+        entry = _memory.get(order_id)
+        if entry is None:
+            return None
+        expires_at, lat, lng = entry
+        if time.monotonic() >= expires_at:
+            del _memory[order_id]
+            return None
+        return lat, lng
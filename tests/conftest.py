@@ -0,0 +1,46 @@
+# tests/conftest.py
+import os
+
+import pytest
+from flask import Flask
+
+from models import db
+import services.order_rollup  # noqa: F401  registers the rollup listener
+
+# Backends for cross-database tests; PostgreSQL runs when a scratch
+# database is given, e.g. TEST_POSTGRES_URL=postgresql://localhost/test
+DATABASE_URLS = {
+    "sqlite": "sqlite://",
+    "postgresql": os.environ.get("TEST_POSTGRES_URL"),
+}
+
+
+def _app(database_url):
+    # Bare app: models and services only, no app.py
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_url
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def app():
+    yield from _app(DATABASE_URLS["sqlite"])
+
+
+@pytest.fixture(params=sorted(DATABASE_URLS))
+def any_app(request):
+    database_url = DATABASE_URLS[request.param]
+    if not database_url:
+        pytest.skip(f"no {request.param} database configured")
+    yield from _app(database_url)
+
+
+@pytest.fixture
+def session(app):
+    return db.session
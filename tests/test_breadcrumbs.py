@@ -0,0 +1,53 @@
+# tests/test_breadcrumbs.py
+import pytest
+
+import services.breadcrumbs as breadcrumbs
+from models import DeliveryPerson, GpsBreadcrumb, Order
+
+
+@pytest.fixture(autouse=True)
+def fresh_buffers(monkeypatch):
+    monkeypatch.setattr(breadcrumbs, "_points", [])
+    monkeypatch.setattr(breadcrumbs, "_riders", {})
+    monkeypatch.setattr(breadcrumbs, "_assignments", {})
+
+
+@pytest.fixture
+def riders(session):
+    session.add_all([
+        DeliveryPerson(id=1, name="Ravi", phone="1", password_hash="x"),
+        DeliveryPerson(id=2, name="Anil", phone="2", password_hash="x"),
+    ])
+    session.add_all([
+        Order(id=10, order_id="A", delivery_person_id=1),
+        Order(id=20, order_id="B", delivery_person_id=2),
+    ])
+    session.commit()
+
+
+def test_rider_assigned(riders):
+    assert breadcrumbs.rider_assigned(1, 10)
+    assert not breadcrumbs.rider_assigned(1, 20)
+    assert not breadcrumbs.rider_assigned(1, 999)
+
+
+def test_unknown_order_does_not_lose_the_batch(riders, session):
+    breadcrumbs.record_point(10, 1, 17.1, 78.1)
+    breadcrumbs.record_point(999, 2, 17.2, 78.2)   # order does not exist
+    breadcrumbs.record_point(20, 2, 17.3, 78.3)
+
+    assert breadcrumbs.flush_breadcrumbs() == 2
+
+    assert {p.order_id for p in GpsBreadcrumb.query.all()} == {10, 20}
+    assert session.get(DeliveryPerson, 2).latitude == 17.3
+
+
+def test_failed_batch_is_retried_row_by_row(riders, session):
+    breadcrumbs.record_point(10, 1, 17.1, 78.1)
+    breadcrumbs.record_point(20, 2, None, 78.2)    # violates NOT NULL
+    breadcrumbs.record_point(20, 2, 17.3, 78.3)
+
+    assert breadcrumbs.flush_breadcrumbs() == 2
+
+    assert sorted(p.lat for p in GpsBreadcrumb.query.all()) == [17.1, 17.3]
+    assert session.get(DeliveryPerson, 1).latitude == 17.1
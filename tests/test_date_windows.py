@@ -0,0 +1,27 @@
+# tests/test_date_windows.py
+from datetime import date, datetime
+
+from models import Order
+from services.date_windows import days_window, ist_day_window, within
+
+
+def test_ist_day_window_is_the_india_local_day_in_utc():
+    assert ist_day_window(date(2026, 10, 14)) == (
+        datetime(2026, 10, 13, 18, 30),
+        datetime(2026, 10, 14, 18, 30),
+    )
+
+
+def test_days_window_includes_to_day():
+    assert days_window(date(2026, 10, 1), date(2026, 10, 7)) == (
+        datetime(2026, 10, 1), datetime(2026, 10, 8)
+    )
+    assert days_window(None, None) == (None, None)
+
+
+def test_within_keeps_the_column_bare():
+    conditions = within(Order.created_at, ist_day_window(date(2026, 10, 14)))
+    assert [str(c) for c in conditions] == [
+        '"order".created_at >= :created_at_1',
+        '"order".created_at < :created_at_1',
+    ]
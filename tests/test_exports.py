@@ -0,0 +1,26 @@
+# tests/test_exports.py
+import csv
+import io
+
+from models import Order, Restaurant
+from services.exports import ORDER_HEADER, order_rows, stream_csv
+
+
+def test_order_export_neutralises_formulas(session):
+    session.add(Restaurant(id=1, name="@Biryani House"))
+    session.add(Order(
+        order_id="X1", restaurant_id=1, customer_name='=HYPERLINK("http://evil","x")',
+        phone="+919999999999", status="Delivered", payment_type="COD",
+        items_total=100, delivery_charge=10, discount=None,
+    ))
+    session.commit()
+
+    document = "".join(stream_csv(ORDER_HEADER, order_rows()))
+    header, row = csv.reader(io.StringIO(document.lstrip("\ufeff")))
+
+    assert header == ORDER_HEADER
+    record = dict(zip(header, row))
+    assert record["Customer"] == '\'=HYPERLINK("http://evil","x")'
+    assert record["Phone"] == "'+919999999999"
+    assert record["Restaurant"] == "'@Biryani House"
+    assert record["Grand Total"] == "110.00"
@@ -0,0 +1,103 @@
+# tests/test_location_throttle.py
+import pytest
+
+import services.location_throttle as throttle
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(throttle, "_riders", {})
+    monkeypatch.setattr(throttle, "_rooms", {})
+    monkeypatch.setattr(throttle, "_counters", dict.fromkeys(throttle._counters, 0))
+    monkeypatch.setattr(throttle, "_accepted_since_prune", 0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(throttle.time, "monotonic", lambda: now[0])
+    return now
+
+
+# ~111 m apart in latitude, far above MIN_MOVE_METERS
+LAT, LNG = 17.385, 78.486
+STEP = 0.001
+
+
+def test_rider_rate_limit(clock):
+    assert throttle.accept_location("r1", 1, LAT, LNG) == (throttle.BROADCAST, 0)
+
+    clock[0] += throttle.RIDER_MIN_INTERVAL_SECONDS / 2
+    assert throttle.accept_location("r1", 1, LAT + STEP, LNG) == (throttle.DROP, 0)
+    assert throttle.tracking_counters()["dropped_rate"] == 1
+
+
+def test_jitter_below_min_move_is_dropped(clock):
+    throttle.accept_location("r1", 1, LAT, LNG)
+
+    clock[0] += throttle.RIDER_MIN_INTERVAL_SECONDS + 0.1
+    # ~1 m: GPS jitter
+    assert throttle.accept_location("r1", 1, LAT + 0.00001, LNG) == (throttle.DROP, 0)
+    assert throttle.tracking_counters()["dropped_jitter"] == 1
+
+    clock[0] += throttle.RIDER_MIN_INTERVAL_SECONDS + 0.1
+    assert throttle.accept_location("r1", 1, LAT + STEP, LNG)[0] == throttle.BROADCAST
+
+
+def test_room_coalescing_schedule_queue_and_drain(clock):
+    room_interval = 1.0 / throttle.ROOM_MAX_BROADCASTS_PER_SECOND
+
+    # Three riders (e.g. reconnects) feeding one order room in a burst
+    assert throttle.accept_location("a", 9, LAT, LNG) == (throttle.BROADCAST, 0)
+
+    clock[0] += 0.1
+    action, delay = throttle.accept_location("b", 9, LAT + STEP, LNG)
+    assert action == throttle.SCHEDULE
+    assert delay == pytest.approx(room_interval - 0.1)
+
+    clock[0] += 0.1
+    assert throttle.accept_location("c", 9, LAT + 2 * STEP, LNG) == (throttle.QUEUED, 0)
+    assert throttle.tracking_counters()["coalesced"] == 1
+
+    # The scheduled flush sends only the newest position, once
+    clock[0] += delay
+    assert throttle.take_pending(9) == (LAT + 2 * STEP, LNG)
+    assert throttle.take_pending(9) is None
+
+    counters = throttle.tracking_counters()
+    assert counters["received"] == 3
+    assert counters["broadcast"] == 2
+
+    # Room interval measured from the flush
+    clock[0] += room_interval
+    assert throttle.accept_location("a", 9, LAT + 3 * STEP, LNG) == (throttle.BROADCAST, 0)
+
+
+def test_take_pending_unknown_room():
+    assert throttle.take_pending(404) is None
+
+
+def test_forget_order_drops_room(clock):
+    throttle.accept_location("a", 5, LAT, LNG)
+    throttle.forget_order(5)
+    assert throttle.tracking_counters()["rooms"] == 0
+
+
+def test_forget_rider_drops_state():
+    throttle.accept_location("sid-1", 7, 17.385, 78.486)
+    assert "sid-1" in throttle._riders
+
+    throttle.forget_rider("sid-1")
+
+    assert "sid-1" not in throttle._riders
+
+
+def test_idle_riders_and_rooms_are_pruned(monkeypatch, clock):
+    monkeypatch.setattr(throttle, "PRUNE_EVERY", 2)
+
+    throttle.accept_location("gone", 1, 17.385, 78.486)
+    clock[0] += throttle.STATE_IDLE_SECONDS + 1
+    throttle.accept_location("active", 2, 17.400, 78.500)
+
+    assert set(throttle._riders) == {"active"}
+    assert set(throttle._rooms) == {"2"}
@@ -0,0 +1,19 @@
+# tests/test_log_config.py
+import json
+import logging
+
+from services.log_config import JsonFormatter
+
+
+def test_json_formatter_emits_extra_fields():
+    record = logging.LogRecord("app", logging.INFO, __file__, 1, "order placed", None, None)
+    record.order_id = "ORD-1-ABC"
+    record.duration_ms = 12.5
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "order placed"
+    assert entry["level"] == "INFO"
+    assert entry["order_id"] == "ORD-1-ABC"
+    assert entry["duration_ms"] == 12.5
+    assert "msg" not in entry and "args" not in entry
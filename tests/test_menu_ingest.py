@@ -0,0 +1,35 @@
+# tests/test_menu_ingest.py
+import io
+
+from services.menu_ingest import missing_columns, parse_menu_csv, parse_price
+
+
+def test_parse_price_keeps_whole_prices_integral():
+    assert parse_price("180") == 180 and isinstance(parse_price("180"), int)
+    assert parse_price("₹1,200") == 1200
+    assert parse_price("180.0") == 180 and isinstance(parse_price("180.0"), int)
+    assert parse_price("99.50") == 99.5
+    assert parse_price("") is None
+    assert parse_price("free") is None
+
+
+def test_parse_menu_csv_rows():
+    text = (
+        "\ufeffname,price,category,description\r\n"
+        'Dosa,60,,"crispy\r\nand hot"\r\n'
+        "No price,,Snacks,\r\n"
+        "Lassi,45.5,Drinks,\r\n"
+    )
+
+    items = list(parse_menu_csv(io.StringIO(text, newline="")))
+
+    assert [i["name"] for i in items] == ["Dosa", "Lassi"]
+    assert items[0]["price"] == 60 and items[0]["category"] == "Other"
+    assert items[0]["description"] == "crispy\r\nand hot"
+    assert items[0]["availability"] == "yes"
+    assert items[1]["price"] == 45.5
+
+
+def test_missing_columns():
+    assert missing_columns("name,price\n") == []
+    assert missing_columns("<!DOCTYPE html>\n") == ["name", "price"]
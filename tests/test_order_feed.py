@@ -0,0 +1,40 @@
+# tests/test_order_feed.py
+from datetime import datetime, timedelta
+
+from models import Order
+from services.order_feed import changes_cursor, is_new_order, order_changes
+
+
+def test_order_changes_resends_late_commits_behind_cursor(session):
+    now = datetime(2026, 10, 14, 12, 0, 0)
+    first = Order(order_id="A1", updated_at=now)
+    session.add(first)
+    session.commit()
+
+    orders, cursor = order_changes("")
+    assert [o.order_id for o in orders] == ["A1"]
+    assert cursor == changes_cursor(now, first.id)
+
+    # Flushed before the poll, committed after it: timestamp behind the cursor
+    session.add(Order(order_id="LATE", updated_at=now - timedelta(seconds=2)))
+    session.add(Order(order_id="B2", updated_at=now + timedelta(seconds=1)))
+    session.commit()
+
+    orders, next_cursor = order_changes(cursor)
+    assert {o.order_id for o in orders} == {"A1", "LATE", "B2"}
+    # Only rows after the old cursor move it
+    assert next_cursor.startswith((now + timedelta(seconds=1)).isoformat())
+
+
+def test_is_new_order_only_for_orders_placed_today_after_cursor(session):
+    now = datetime(2026, 10, 14, 12, 0, 0)
+    cursor = changes_cursor(now, 1)
+    today = now.date()
+
+    placed = Order(order_id="NEW", created_at=now + timedelta(seconds=5))
+    old_order = Order(order_id="OLD", created_at=now - timedelta(days=3))
+    earlier_today = Order(order_id="EARLY", created_at=now - timedelta(hours=2))
+
+    assert is_new_order(placed, cursor, today)
+    assert not is_new_order(old_order, cursor, today)
+    assert not is_new_order(earlier_today, cursor, today)
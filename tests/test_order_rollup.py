@@ -0,0 +1,92 @@
+# tests/test_order_rollup.py
+from datetime import datetime
+
+from sqlalchemy import func
+
+from models import DailyOrderStats, Order
+from services.order_rollup import SUM_COLUMNS, backfill_daily_order_stats
+
+
+def _rollup():
+    return {
+        (r.restaurant_id, r.day, r.payment_type, r.status):
+            tuple(round(getattr(r, name), 2) for name in SUM_COLUMNS)
+        for r in DailyOrderStats.query.all()
+        if r.order_count
+    }
+
+
+def _from_orders():
+    # What the rollup must equal: the same buckets aggregated from Order
+    expected = {}
+    for o in Order.query.all():
+        key = (o.restaurant_id or 0, o.created_at.date(), o.payment_type or "", o.status or "")
+        amounts = (
+            1, o.items_total or 0, o.delivery_charge or 0, o.discount or 0,
+            o.restaurant_offer_discount or 0, o.get_final_total(),
+        )
+        current = expected.get(key, (0,) * len(SUM_COLUMNS))
+        expected[key] = tuple(a + b for a, b in zip(current, amounts))
+    return {key: tuple(round(v, 2) for v in amounts) for key, amounts in expected.items()}
+
+
+def _orders():
+    return [
+        Order(restaurant_id=1, created_at=datetime(2026, 10, 1, 9), status="Pending",
+              payment_type="COD", items_total=100, delivery_charge=20, discount=None),
+        Order(restaurant_id=1, created_at=datetime(2026, 10, 1, 23, 59), status="Pending",
+              payment_type="Online", items_total=55.55, delivery_charge=None, discount=5,
+              restaurant_offer_discount=10),
+        Order(restaurant_id=2, created_at=datetime(2026, 10, 2, 0, 0), payment_type=None,
+              items_total=None, delivery_charge=30, discount=0),
+    ]
+
+
+def test_rollup_tracks_insert(session):
+    session.add_all(_orders())
+    session.commit()
+
+    assert _rollup() == _from_orders()
+
+
+def test_rollup_tracks_status_and_total_changes(session):
+    first, second, third = _orders()
+    session.add_all([first, second, third])
+    session.commit()
+
+    first.status = "Delivered"
+    second.status = "Cancelled"
+    third.items_total = 80
+    third.payment_type = "COD"
+    session.commit()
+
+    first.status = "Delivered"  # no-op change
+    second.discount = 7.5
+    session.commit()
+
+    assert _rollup() == _from_orders()
+
+
+def test_rollup_tracks_delete(session):
+    first, second, third = _orders()
+    session.add_all([first, second, third])
+    session.commit()
+
+    session.delete(second)
+    third.status = "Delivered"
+    session.commit()
+
+    assert _rollup() == _from_orders()
+    assert session.query(func.sum(DailyOrderStats.order_count)).scalar() == Order.query.count()
+
+
+def test_backfill_matches_listener(session):
+    session.add_all(_orders())
+    session.commit()
+    Order.query.first().status = "Delivered"
+    session.commit()
+    maintained = _rollup()
+
+    backfill_daily_order_stats()
+
+    assert _rollup() == maintained == _from_orders()
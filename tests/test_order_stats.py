@@ -0,0 +1,94 @@
+# tests/test_order_stats.py
+from datetime import date, datetime, timedelta
+
+from models import Order, Restaurant
+from services.order_stats import FINAL_TOTAL, admin_order_stats
+
+TODAY = date(2026, 10, 14)                       # a Wednesday
+WEEK_START = TODAY - timedelta(days=TODAY.weekday())
+
+
+def _order(restaurant_id, created_at, status, payment_type,
+           items_total, delivery_charge, discount, delivery_person_id=None):
+    return Order(
+        restaurant_id=restaurant_id,
+        created_at=created_at,
+        status=status,
+        payment_type=payment_type,
+        items_total=items_total,
+        delivery_charge=delivery_charge,
+        discount=discount,
+        delivery_person_id=delivery_person_id,
+    )
+
+
+def _seed(session):
+    session.add_all([Restaurant(id=1, name="A"), Restaurant(id=2, name="B")])
+    today = datetime.combine(TODAY, datetime.min.time())
+    session.add_all([
+        # NULL discounts / charges, odd paise, every status, both payments
+        _order(1, today + timedelta(hours=9), "Delivered", "COD", 199.99, 30, None),
+        _order(1, today + timedelta(hours=23, minutes=59), "Delivered", "Online", 120.555, None, 20.005),
+        _order(2, today + timedelta(hours=1), "Delivered", None, None, 25, 0),
+        _order(2, today + timedelta(hours=2), "Pending", "COD", 80, 20, None),
+        _order(1, today + timedelta(hours=3), "Preparing", "Online", 50.1, 10.2, 5.3, delivery_person_id=7),
+        _order(2, today - timedelta(days=1), "Cancelled", "COD", 60, 0, None),
+        _order(1, today - timedelta(days=2), "Delivered", "COD", 333.333, 15.5, 33.33),
+        _order(2, datetime.combine(WEEK_START, datetime.min.time()) - timedelta(seconds=1),
+               "Delivered", "Online", 999.99, 40, 100),
+        _order(1, today - timedelta(days=40), "Delivered", "COD", 10.005, None, None),
+        _order(2, today + timedelta(hours=4), "Out for Delivery", "COD", 70, 20, 0, delivery_person_id=8),
+    ])
+    session.commit()
+
+
+def _legacy_stats(today, week_start):
+    # The admin dashboard's former per-order Python loops
+    delivered_today = [
+        o for o in Order.query.all()
+        if o.created_at.date() == today and o.status == "Delivered"
+    ]
+    return {
+        "total_orders": Order.query.count(),
+        "pending": Order.query.filter_by(status="Pending").count(),
+        "preparing": Order.query.filter_by(status="Preparing").count(),
+        "assigned": Order.query.filter(
+            Order.delivery_person_id.isnot(None),
+            Order.status != "Delivered",
+            Order.status != "Cancelled"
+        ).count(),
+        "delivered": Order.query.filter_by(status="Delivered").count(),
+        "cancelled": Order.query.filter_by(status="Cancelled").count(),
+        "total_orders_today": len(delivered_today),
+        "total_revenue_today": sum(o.get_final_total() for o in delivered_today),
+        "week_orders": Order.query.filter(Order.created_at >= week_start).count(),
+        "total_revenue": sum(o.get_final_total() for o in Order.query.filter_by(status="Delivered").all()),
+        "weekly_revenue": sum(
+            o.get_final_total() for o in Order.query.filter(
+                Order.created_at >= week_start,
+                Order.status == "Delivered"
+            ).all()
+        ),
+    }
+
+
+def test_final_total_matches_get_final_total(session):
+    _seed(session)
+
+    for order in Order.query.all():
+        sql_total = session.query(FINAL_TOTAL).filter(Order.id == order.id).scalar()
+        assert float(sql_total) == order.get_final_total()
+
+
+def test_admin_order_stats_match_legacy_loops(session):
+    _seed(session)
+
+    legacy = _legacy_stats(TODAY, WEEK_START)
+    stats = admin_order_stats(TODAY, WEEK_START)
+
+    assert stats.keys() == legacy.keys()
+    for key, value in legacy.items():
+        if isinstance(value, float):
+            assert stats[key] == round(value, 2), key
+        else:
+            assert stats[key] == value, key
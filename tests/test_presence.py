@@ -0,0 +1,46 @@
+# tests/test_presence.py
+import pytest
+
+import services.presence as presence
+
+
+@pytest.fixture(params=["memory", "redis"])
+def store(request):
+    client = None
+    if request.param == "redis":
+        client = pytest.importorskip("fakeredis").FakeRedis()
+    presence.init_presence(client=client)
+    yield
+    presence.init_presence()
+
+
+def _expire_now(monkeypatch):
+    now = presence.time.time()
+    monkeypatch.setattr(
+        presence.time, "time", lambda: now + presence.PRESENCE_TIMEOUT_SECONDS + 1
+    )
+
+
+def test_expired_rider_keeps_socket_count(store, monkeypatch):
+    assert presence.rider_connected(5, {1})
+    assert not presence.rider_connected(5, {1})    # second tab
+
+    _expire_now(monkeypatch)
+    assert presence.expire_riders() == [5]
+    assert presence.online_rider_ids(1) == set()
+
+    # Heartbeat on an open socket: back online, count untouched
+    assert presence.rider_heartbeat(5)
+    assert presence.online_rider_ids(1) == {5}
+
+    assert not presence.rider_disconnected(5)      # one socket still open
+    assert presence.online_rider_ids(1) == {5}
+    assert presence.rider_disconnected(5)          # last one
+    assert presence.online_rider_ids(1) == set()
+
+
+def test_heartbeat_only_reports_transitions(store):
+    assert presence.rider_connected(7, {2})
+    assert not presence.rider_heartbeat(7)
+    assert presence.rider_disconnected(7)
+    assert not presence.rider_disconnected(7)
@@ -0,0 +1,113 @@
+# tests/test_query_plans.py
+"""
+EXPLAIN QUERY PLAN checks: every hot Order query must be served by the
+index built for it (models.Order.__table_args__, ix_order_updated_at).
+SQLite only, but the composite column orders are what PostgreSQL needs
+too: equality columns first, then the range / sort column.
+"""
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import event
+
+from models import db, Order
+from services.order_feed import changes_cursor, live_orders, order_changes, order_history
+from services.reports import admin_report, restaurant_report
+
+TODAY = date(2026, 10, 14)
+WEEK = (datetime(2026, 10, 12), datetime(2026, 10, 19))
+
+
+def _order_plans(run):
+    """
+    Runs run() and returns the query plan detail lines of every SELECT
+    it issued against the order table.
+    """
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and '"order"' in statement:
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        run()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+
+    assert statements, "no query against order was issued"
+    connection = db.session.connection()
+    return [
+        " | ".join(row[-1] for row in connection.exec_driver_sql(
+            "EXPLAIN QUERY PLAN " + statement, parameters
+        ))
+        for statement, parameters in statements
+    ]
+
+
+HOT_QUERIES = {
+    # services/order_feed.py
+    "live_orders": (
+        lambda: live_orders(1, TODAY),
+        "ix_order_restaurant_id_created_at (restaurant_id=?)",
+    ),
+    "order_history": (
+        lambda: order_history(1, TODAY, before_id=500),
+        "ix_order_restaurant_id_created_at (restaurant_id=? AND created_at<?)",
+    ),
+    "order_changes": (
+        lambda: order_changes(changes_cursor(datetime(2026, 10, 14, 12), 5)),
+        "ix_order_updated_at (updated_at>?)",
+    ),
+    # services/reports.py
+    "restaurant_report": (
+        lambda: restaurant_report(1, WEEK),
+        "ix_order_restaurant_id_created_at (restaurant_id=? AND created_at>? AND created_at<?)",
+    ),
+    "admin_report": (
+        lambda: admin_report(None, WEEK, "week"),
+        "ix_order_restaurant_id_created_at (restaurant_id=? AND created_at>? AND created_at<?)",
+    ),
+    # app.py: delivery dashboard queue / history (same filters)
+    "rider_queue": (
+        lambda: Order.query.filter(
+            Order.delivery_person_id == 3,
+            Order.status.in_(["Out for Delivery", "Started"])
+        ).all(),
+        "ix_order_delivery_person_id_status (delivery_person_id=? AND status=?)",
+    ),
+    # app.py: my_orders customer history
+    "customer_orders": (
+        lambda: Order.query.filter(
+            Order.phone == "9999999999",
+            Order.status.in_(["Delivered", "Cancelled"])
+        ).order_by(Order.created_at.desc()).all(),
+        "ix_order_phone_status (phone=? AND status=?)",
+    ),
+    # app.py: one-offer-per-device check (either single-column index serves it)
+    "offer_usage": (
+        lambda: Order.query.filter(
+            Order.restaurant_offer_id == 2,
+            Order.device_fingerprint == "fp"
+        ).count(),
+        "USING INDEX ix_order_",
+    ),
+    # app.py: admin status counters
+    "status_count": (
+        lambda: Order.query.filter_by(status="Pending").count(),
+        "ix_order_status (status=?)",
+    ),
+}
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_its_index(session, name):
+    run, expected = HOT_QUERIES[name]
+    session.add(Order(order_id="seed", restaurant_id=1))
+    session.commit()
+
+    plans = _order_plans(run)
+
+    # The first statement is the main query (later ones are selectin loads)
+    assert expected in plans[0], plans[0]
+    assert "SCAN order" not in plans[0], plans[0]
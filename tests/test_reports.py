@@ -0,0 +1,71 @@
+# tests/test_reports.py
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from models import db, Order, Restaurant
+from services.reports import admin_report, period_bucket, _as_date
+
+# Around week, month and year edges (2026-10-18 is a Sunday)
+EDGE_TIMESTAMPS = [
+    datetime(2026, 10, 18, 23, 59, 59),    # Sunday night: week of the 12th
+    datetime(2026, 10, 19, 0, 0, 0),       # Monday midnight: new week
+    datetime(2026, 10, 17, 12, 0, 0),      # Saturday
+    datetime(2026, 10, 31, 23, 59, 59),    # last second of a month
+    datetime(2026, 11, 1, 0, 0, 0),        # Sunday, first of a month
+    datetime(2026, 3, 1, 8, 0, 0),         # Sunday after February
+    datetime(2024, 2, 29, 18, 0, 0),       # leap day
+    datetime(2026, 1, 1, 9, 0, 0),         # Thursday: week starts in 2025
+    datetime(2025, 12, 29, 0, 0, 0),       # that Monday
+]
+
+
+def _expected(moment, period):
+    day = moment.date()
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    if period == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _seed():
+    db.session.add(Restaurant(id=1, name="A"))
+    for i, moment in enumerate(EDGE_TIMESTAMPS):
+        db.session.add(Order(
+            order_id=f"E{i}", restaurant_id=1, created_at=moment,
+            status="Delivered", payment_type="COD",
+            items_total=100 + i, delivery_charge=10, discount=None,
+        ))
+    db.session.commit()
+
+
+@pytest.mark.parametrize("period", ["day", "week", "month"])
+def test_period_bucket_edges(any_app, period):
+    _seed()
+    dialect = db.session.get_bind().dialect.name
+    bucket = period_bucket(Order.created_at, period, dialect)
+
+    rows = db.session.query(Order.created_at, bucket).order_by(Order.id).all()
+
+    for created_at, value in rows:
+        assert _as_date(value) == _expected(created_at, period), created_at
+        if period == "week":
+            assert _as_date(value).weekday() == 0  # Monday
+
+
+def test_admin_report_week_rows(any_app):
+    _seed()
+
+    reports, summary = admin_report(None, (None, None), "week")
+
+    weeks = {row["period"]: row["total_orders"] for row in reports}
+    expected = {}
+    for moment in EDGE_TIMESTAMPS:
+        monday = _expected(moment, "week")
+        expected[monday] = expected.get(monday, 0) + 1
+    assert weeks == expected
+    assert date(2026, 10, 12) in weeks and date(2025, 12, 29) in weeks
+
+    assert len(summary) == 1
+    assert summary[0]["items_total"] == sum(100 + i for i in range(len(EDGE_TIMESTAMPS)))